@@ -0,0 +1,211 @@
+"""Offline asset bake: pack the sprites into one atlas plus a manifest.
+
+Startup otherwise opens and decodes every sprite file separately, scales
+the 1024 px decoration frames down and scans the background and sound
+directories. ``python3 bake.py`` does all of that once and writes
+``assets/baked/``:
+
+* ``sprites.png``: every sprite frame, already sliced and pre-scaled,
+  packed into a single texture atlas;
+* ``manifest.json``: the frame rects, the scale factors still to apply,
+  the background and sound file lists, and a content hash of the sprite
+  sources, the bake settings and the file names in the background and
+  sound directories.
+
+``game.init`` reads the manifest and the atlas instead of the raw files.
+It falls back to the raw assets when the bake is missing or stale, that
+is when a source sprite or a setting such as ``ZOMBIE_SCALE`` changed, or
+when a background or sound file was added or removed. Staleness is checked
+with a ``stat`` of each source and directory against the mtimes and sizes
+in the manifest; contents are only hashed again when one of those differs.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import pygame
+
+MANIFEST_VERSION = 3
+MANIFEST_NAME = "manifest.json"
+ATLAS_NAME = "sprites.png"
+ATLAS_WIDTH = 1024
+
+
+def content_hash(asset_dir, sources, settings, listed=()):
+    """Hash the contents of ``sources`` (relative paths) and ``settings``.
+
+    The directories in ``listed`` only contribute the names of their files.
+    """
+    digest = hashlib.sha1(json.dumps(settings, sort_keys=True).encode())
+    for rel in sources:
+        digest.update(rel.encode())
+        with open(os.path.join(asset_dir, rel), "rb") as fh:
+            digest.update(fh.read())
+    for rel in listed:
+        path = os.path.join(asset_dir, rel)
+        for name in sorted(os.listdir(path)):
+            if os.path.isfile(os.path.join(path, name)):
+                digest.update(f"{rel}/{name}".encode())
+    return digest.hexdigest()
+
+
+def list_dirs(asset_dir, roots):
+    """Relative paths of ``roots`` and every directory below them."""
+    dirs = []
+    for rel in roots:
+        for root, subdirs, _ in os.walk(os.path.join(asset_dir, rel)):
+            subdirs.sort()
+            dirs.append(os.path.relpath(root, asset_dir).replace(os.sep, "/"))
+    return dirs
+
+
+def stamps(asset_dir, sources, listed):
+    """``[mtime_ns, size]`` of each source and the mtime of each listed dir.
+
+    Adding or removing a file changes its directory's mtime.
+    """
+    out = {}
+    for rel in sources:
+        st = os.stat(os.path.join(asset_dir, rel))
+        out[rel] = [st.st_mtime_ns, st.st_size]
+    for rel in listed:
+        out[rel] = [os.stat(os.path.join(asset_dir, rel)).st_mtime_ns]
+    return out
+
+
+def read_manifest(bake_dir, asset_dir, settings):
+    """Return the manifest in ``bake_dir``, or ``None`` if missing or stale."""
+    try:
+        with open(os.path.join(bake_dir, MANIFEST_NAME)) as fh:
+            manifest = json.load(fh)
+        if manifest.get("version") != MANIFEST_VERSION or manifest["settings"] != settings:
+            return None
+        sources, listed = manifest["sources"], manifest["listed"]
+        if manifest["stamps"] != stamps(asset_dir, sources, listed):
+            # Something was touched; the bake still holds if nothing changed
+            if manifest["hash"] != content_hash(asset_dir, sources, settings, listed):
+                return None
+    except (OSError, ValueError, KeyError):
+        return None
+    return manifest
+
+
+def load_sprites(manifest, bake_dir):
+    """Load the atlas and return ``{name: surfaces}`` as laid out at bake time."""
+    atlas = pygame.image.load(os.path.join(bake_dir, manifest["atlas"])).convert_alpha()
+
+    def unpack(entry):
+        # A rect is a list of four ints; anything else is a nested list
+        if len(entry) == 4 and all(isinstance(v, int) for v in entry):
+            return atlas.subsurface(entry)
+        return [unpack(e) for e in entry]
+
+    return {name: unpack(entry) for name, entry in manifest["sprites"].items()}
+
+
+def pack(sizes, width=ATLAS_WIDTH):
+    """Shelf-pack ``sizes``; return ``(positions, height)`` in input order."""
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    positions = [None] * len(sizes)
+    x = y = shelf = 0
+    for i in order:
+        w, h = sizes[i]
+        if w > width:
+            raise ValueError(f"sprite of width {w} does not fit a {width} px atlas")
+        if x + w > width:
+            x, y, shelf = 0, y + shelf, 0
+        positions[i] = (x, y)
+        x += w
+        shelf = max(shelf, h)
+    return positions, y + shelf
+
+
+def _flatten(entry, out):
+    if isinstance(entry, pygame.Surface):
+        out.append(entry)
+    else:
+        for e in entry:
+            _flatten(e, out)
+
+
+def bake(bake_dir=None):
+    """Bake the game's sprites into ``bake_dir``; return the manifest."""
+    import game
+
+    bake_dir = bake_dir or game.BAKE_DIR
+    if not pygame.display.get_surface():
+        pygame.display.init()
+        pygame.display.set_mode((1, 1), pygame.HIDDEN)
+
+    sprites = game.load_raw_sprites()
+    # The decoration frames are 1024 px images drawn at player size; store
+    # them pre-scaled so the atlas stays small and spawning needs no scaling
+    scale = sprites.pop("blue_flower_scale")
+    sprites["blue_flower"] = [
+        pygame.transform.scale(f, (int(f.get_width() * scale), int(f.get_height() * scale)))
+        for f in sprites["blue_flower"]
+    ]
+    zombie_frame_size = sprites.pop("zombie_frame_size")
+
+    surfaces = []
+    for entry in sprites.values():
+        _flatten(entry, surfaces)
+    positions, height = pack([s.get_size() for s in surfaces])
+    atlas = pygame.Surface((ATLAS_WIDTH, height), pygame.SRCALPHA)
+    rects = {}
+    for surface, pos in zip(surfaces, positions):
+        rects[id(surface)] = list(atlas.blit(surface, pos))
+
+    def layout(entry):
+        if isinstance(entry, pygame.Surface):
+            return rects[id(entry)]
+        return [layout(e) for e in entry]
+
+    def relative(path):
+        return os.path.relpath(path, game.ASSET_DIR).replace(os.sep, "/")
+
+    sources = [relative(p) for p in game.SPRITE_SOURCES]
+    listed = list_dirs(game.ASSET_DIR, [relative(game.BACKGROUND_DIR), relative(game.sound_dir)])
+    game.find_background_tiles()
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "hash": content_hash(game.ASSET_DIR, sources, game.BAKE_SETTINGS, listed),
+        "settings": game.BAKE_SETTINGS,
+        "sources": sources,
+        "listed": listed,
+        "stamps": stamps(game.ASSET_DIR, sources, listed),
+        "atlas": ATLAS_NAME,
+        "sprites": {name: layout(entry) for name, entry in sprites.items()},
+        "scales": {"blue_flower": 1.0},
+        "zombie_frame_size": list(zombie_frame_size),
+        "backgrounds": [relative(p) for p in game.BACKGROUND_TILES],
+        "sounds": {
+            prefix: [relative(p) for p in game.find_sound_files(prefix)]
+            for prefix in game.SOUND_PREFIXES
+        },
+    }
+
+    os.makedirs(bake_dir, exist_ok=True)
+    pygame.image.save(atlas, os.path.join(bake_dir, ATLAS_NAME))
+    with open(os.path.join(bake_dir, MANIFEST_NAME), "w") as fh:
+        json.dump(manifest, fh, indent=1)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", help="output directory (default: assets/baked)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    manifest = bake(args.out)
+    print(f"baked {len(manifest['sources'])} sprite files in {time.perf_counter() - start:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
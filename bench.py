@@ -0,0 +1,337 @@
+"""Reproducible frame-time benchmarks for the game loop.
+
+Runs named stress scenarios headlessly through SDL's dummy video and audio
+drivers with a fixed seed and a fixed frame step, then reports frame time
+statistics, per-phase timings and allocations per frame as JSON::
+
+    python3 bench.py                          # run every scenario
+    python3 bench.py -s level-1 -s horde      # run selected scenarios
+    python3 bench.py -o results.json          # save the results
+    python3 bench.py --compare results.json   # flag regressions
+
+``--compare`` exits with status 1 when a scenario got slower than the stored
+baseline by more than ``--threshold``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+# Must be set before pygame is imported by ``game``
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+import game  # noqa: E402
+from simulation import Inputs, collide, level_settings, start_level, update  # noqa: E402
+
+DEFAULT_SEED = 1234
+DEFAULT_FRAMES = 600
+DEFAULT_WARMUP = 60
+DEFAULT_THRESHOLD = 0.10
+FRAME_DT = 1 / 60
+PHASES = ("update", "collision", "render")
+
+# Milliseconds ``game.init`` took, measured on the first ``init_game`` call
+INIT_MS = None
+
+
+class Scenario:
+    """A scripted benchmark: level setup, per-frame input and what to draw.
+
+    ``mode`` is ``"play"`` for the in-game frame, ``"shop"`` for the game
+    frame with the shop dropdown open and ``"pause"`` for the pause menu.
+    ``script`` is called before every frame with the state, the reusable
+    ``Inputs`` and a dedicated random generator for scripted actions.
+    """
+
+    def __init__(self, name, description, level=1, enemy_count=None, mode="play", script=None):
+        self.name = name
+        self.description = description
+        self.level = level
+        self.enemy_count = enemy_count
+        self.mode = mode
+        self.script = script
+
+    def settings(self):
+        enemy_speed, coin_speed, enemy_count, ammo_interval, coin_delay = level_settings(self.level)
+        if self.enemy_count is not None:
+            enemy_count = self.enemy_count
+        return enemy_speed, coin_speed, enemy_count, ammo_interval, coin_delay
+
+
+def _wander(state, inputs, frame, rng):
+    """Walk the player around in slow squares so animation code stays hot."""
+    leg = (frame // 45) % 4
+    inputs.right = leg == 0
+    inputs.down = leg == 1
+    inputs.left = leg == 2
+    inputs.up = leg == 3
+    inputs.throws = ()
+
+
+def _keep_shuriken_alive(count):
+    def script(state, inputs, frame, rng):
+        _wander(state, inputs, frame, rng)
+        cfg = state.config
+        projectiles = state.projectiles
+        while len(projectiles) < count:
+            vx, vy = rng.choice(((1, 0), (-1, 0), (0, 1), (0, -1)))
+            projectiles.spawn().reset(
+                rng.uniform(0, cfg.width),
+                rng.uniform(0, cfg.height),
+                vx * cfg.projectile_speed,
+                vy * cfg.projectile_speed,
+            )
+    return script
+
+
+SCENARIOS = [
+    Scenario("level-1", "level 1 baseline", script=_wander),
+    Scenario("horde", "level 30 with 100 zombies", level=30, enemy_count=100, script=_wander),
+    Scenario("shuriken-200", "200 live shuriken", script=_keep_shuriken_alive(200)),
+    Scenario("shop-open", "shop dropdown open", mode="shop", script=_wander),
+    Scenario("pause-idle", "pause menu idle", mode="pause"),
+]
+
+
+def init_game():
+    """Initialise ``game`` once, recording how long startup took."""
+    global INIT_MS
+    if game.screen is None:
+        start = time.perf_counter()
+        game.init()
+        INIT_MS = (time.perf_counter() - start) * 1000
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def _summary_ms(samples):
+    ordered = sorted(samples)
+    n = len(ordered)
+    return {
+        "mean": sum(ordered) / n * 1000 if n else 0.0,
+        "p50": percentile(ordered, 50) * 1000,
+        "p95": percentile(ordered, 95) * 1000,
+        "p99": percentile(ordered, 99) * 1000,
+        "max": ordered[-1] * 1000 if n else 0.0,
+    }
+
+
+def _run_frames(scenario, frames, seed, trace_memory=False):
+    """Play ``frames`` frames of ``scenario`` and collect per-frame samples."""
+    random.seed(seed)
+    script_rng = random.Random(seed)
+    state = game.GameState(game.SIM_CONFIG, seed=seed)
+    settings = scenario.settings()
+    start_level(state, scenario.level, *settings)
+    decorations = [game.spawn_random_decoration() for _ in range(4)]
+    inputs = Inputs()
+    renderer = game.create_renderer(game.RENDER_BACKEND)
+    values = [game.master_volume, game.sfx_volume, game.music_volume]
+    perf = time.perf_counter
+
+    samples = {phase: [] for phase in PHASES}
+    totals = []
+    alloc_bytes = []
+    alloc_blocks = []
+    entities = {"enemies": 0, "projectiles": 0, "coins": 0}
+
+    for frame in range(frames):
+        if trace_memory:
+            tracemalloc.reset_peak()
+            base_bytes = tracemalloc.get_traced_memory()[0]
+        base_blocks = sys.getallocatedblocks()
+
+        t0 = perf()
+        pygame.event.pump()
+        if scenario.mode != "pause":
+            if scenario.script:
+                scenario.script(state, inputs, frame, script_rng)
+            for deco in decorations:
+                deco.update(FRAME_DT)
+            result = update(state, inputs, FRAME_DT)
+        t1 = perf()
+        if scenario.mode != "pause":
+            if result is None:
+                result = collide(state)
+            if result is not None:
+                # Keep the scenario running at the same intensity
+                start_level(state, scenario.level, *settings)
+        t2 = perf()
+        if scenario.mode == "pause":
+            game.draw_pause_menu(False, False, 0, values)
+            pygame.display.flip()
+        elif game.USE_DIRTY_RECTS or isinstance(renderer, game.TextureRenderer):
+            renderer.render(state, decorations, scenario.mode == "shop")
+        else:
+            game.draw_level(state, decorations, scenario.mode == "shop")
+            pygame.display.flip()
+        t3 = perf()
+
+        samples["update"].append(t1 - t0)
+        samples["collision"].append(t2 - t1)
+        samples["render"].append(t3 - t2)
+        totals.append(t3 - t0)
+        alloc_blocks.append(sys.getallocatedblocks() - base_blocks)
+        if trace_memory:
+            alloc_bytes.append(tracemalloc.get_traced_memory()[1] - base_bytes)
+        entities["enemies"] = max(entities["enemies"], len(state.enemies))
+        entities["projectiles"] = max(entities["projectiles"], len(state.projectiles))
+        entities["coins"] = max(entities["coins"], len(state.coins))
+
+    return totals, samples, alloc_bytes, alloc_blocks, entities
+
+
+def run_scenario(scenario, frames=DEFAULT_FRAMES, warmup=DEFAULT_WARMUP, seed=DEFAULT_SEED):
+    """Benchmark one scenario and return its result dictionary.
+
+    The timed pass runs without memory tracing. A second, identical pass
+    runs under ``tracemalloc`` to measure the peak number of bytes allocated
+    within each frame without distorting the timings.
+    """
+    _run_frames(scenario, warmup, seed)
+    totals, samples, _, alloc_blocks, entities = _run_frames(scenario, frames, seed)
+
+    tracemalloc.start()
+    try:
+        _, _, alloc_bytes, _, _ = _run_frames(scenario, frames, seed, trace_memory=True)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "description": scenario.description,
+        "frames": frames,
+        "frame_ms": _summary_ms(totals),
+        "phase_ms": {phase: _summary_ms(values) for phase, values in samples.items()},
+        "alloc_bytes_per_frame": sum(alloc_bytes) / len(alloc_bytes) if alloc_bytes else 0.0,
+        "net_blocks_per_frame": sum(alloc_blocks) / len(alloc_blocks) if alloc_blocks else 0.0,
+        "max_entities": entities,
+    }
+
+
+def run_benchmarks(names=None, frames=DEFAULT_FRAMES, warmup=DEFAULT_WARMUP, seed=DEFAULT_SEED):
+    """Run the selected scenarios (all by default) and return a report."""
+    init_game()
+    selected = [s for s in SCENARIOS if not names or s.name in names]
+    unknown = set(names or ()) - {s.name for s in SCENARIOS}
+    if unknown:
+        raise ValueError(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    report = {
+        "meta": {
+            "seed": seed,
+            "backend": game.SIM_CONFIG.backend,
+            "dirty_rects": game.USE_DIRTY_RECTS,
+            "renderer": type(game.RENDERER).__name__,
+            "frames": frames,
+            "warmup": warmup,
+            "init_ms": INIT_MS,
+            "resolution": list(game.screen.get_size()),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+        },
+        "scenarios": {},
+    }
+    for scenario in selected:
+        report["scenarios"][scenario.name] = run_scenario(scenario, frames, warmup, seed)
+    return report
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return a list of regression messages relative to ``baseline``.
+
+    Mean, p95 and p99 frame times as well as each phase's mean are compared;
+    anything slower than the baseline by more than ``threshold`` is flagged.
+    """
+    regressions = []
+    for name, result in report["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        checks = [(f"frame {key}", result["frame_ms"][key], base["frame_ms"][key]) for key in ("mean", "p95", "p99")]
+        for phase in PHASES:
+            if phase in base.get("phase_ms", {}):
+                checks.append((f"{phase} mean", result["phase_ms"][phase]["mean"], base["phase_ms"][phase]["mean"]))
+        for label, now, before in checks:
+            if before > 0 and now > before * (1 + threshold):
+                regressions.append(
+                    f"{name}: {label} {now:.3f} ms vs {before:.3f} ms (+{(now / before - 1) * 100:.1f}%)"
+                )
+    return regressions
+
+
+def format_report(report):
+    lines = []
+    for name, result in report["scenarios"].items():
+        frame = result["frame_ms"]
+        phases = result["phase_ms"]
+        lines.append(
+            f"{name:<14} mean {frame['mean']:7.3f}  p50 {frame['p50']:7.3f}  "
+            f"p95 {frame['p95']:7.3f}  p99 {frame['p99']:7.3f} ms  | "
+            + "  ".join(f"{phase} {phases[phase]['mean']:.3f}" for phase in PHASES)
+            + f"  | {result['alloc_bytes_per_frame']:.0f} B/frame"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-s", "--scenario", action="append", dest="scenarios", help="scenario to run (repeatable)")
+    parser.add_argument("-n", "--frames", type=int, default=DEFAULT_FRAMES, help="measured frames per scenario")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="unmeasured frames before timing")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="random seed for every scenario")
+    parser.add_argument("-o", "--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a stored JSON report")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown, e.g. 0.1 for 10%%")
+    parser.add_argument("--backend", choices=("auto", "python", "numpy"), help="force a simulation backend")
+    parser.add_argument("--full-redraw", action="store_true", help="flip the whole screen instead of dirty rects")
+    parser.add_argument("--renderer", choices=game.RENDER_BACKENDS, help="level renderer to draw with")
+    parser.add_argument("--list", action="store_true", help="list the available scenarios and exit")
+    args = parser.parse_args(argv)
+    if args.renderer:
+        game.RENDER_BACKEND = args.renderer
+    init_game()
+    if args.backend:
+        game.SIM_CONFIG.backend = args.backend
+    if args.full_redraw:
+        game.USE_DIRTY_RECTS = False
+
+    if args.list:
+        for scenario in SCENARIOS:
+            print(f"{scenario.name:<14} {scenario.description}")
+        return 0
+
+    report = run_benchmarks(args.scenarios, args.frames, args.warmup, args.seed)
+    print(f"init {INIT_MS:.1f} ms")
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Compact pooled entity records for the main game loop.
+
+Entities are plain ``__slots__`` objects so that attribute access is cheap and
+no per-instance ``__dict__`` is allocated. Each kind of entity lives in an
+``EntityPool`` which keeps the live objects in a dense list and recycles dead
+ones through a free list, so the 60 fps loop does not churn the allocator.
+"""
+
+
+class Enemy:
+    """Zombie position, velocity and animation state.
+
+    ``sheet`` selects one of the zombie sprite sheets and ``frame`` the
+    column within the row for ``direction``; the renderer maps these onto
+    pre-sliced images.
+    """
+
+    __slots__ = ("x", "y", "dx", "dy", "direction", "sheet", "frame", "anim_timer")
+
+    def __init__(self):
+        self.reset(0, 0, 0, 0, "down", 0)
+
+    def reset(self, x, y, dx, dy, direction, sheet):
+        self.x = x
+        self.y = y
+        self.dx = dx
+        self.dy = dy
+        self.direction = direction
+        self.sheet = sheet
+        self.frame = 0
+        self.anim_timer = 0
+
+
+class Projectile:
+    """Thrown shuriken travelling in a straight line while spinning."""
+
+    __slots__ = ("x", "y", "dx", "dy", "angle")
+
+    def __init__(self):
+        self.reset(0, 0, 0, 0)
+
+    def reset(self, x, y, dx, dy, angle=0):
+        self.x = x
+        self.y = y
+        self.dx = dx
+        self.dy = dy
+        self.angle = angle
+
+
+class Coin:
+    """Animated coin drifting across the play area."""
+
+    __slots__ = ("x", "y", "dx", "dy", "anim_index", "anim_timer")
+
+    def __init__(self):
+        self.reset(0, 0, 0, 0)
+
+    def reset(self, x, y, dx, dy):
+        self.x = x
+        self.y = y
+        self.dx = dx
+        self.dy = dy
+        self.anim_index = 0
+        self.anim_timer = 0
+
+
+class AmmoPickup:
+    """Stationary shuriken pickup centred on ``(x, y)``."""
+
+    __slots__ = ("x", "y")
+
+    def __init__(self):
+        self.reset(0, 0)
+
+    def reset(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class EntityPool:
+    """Dense list of live entities backed by a free list of spare objects.
+
+    ``spawn`` hands out a recycled object when one is available and
+    ``despawn`` removes an entity in O(1) by moving the last live entity into
+    its slot. Callers iterating by index should therefore not advance the
+    index after despawning, because a not yet visited entity now occupies it.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.active = []
+        self.free = []
+
+    def __len__(self):
+        return len(self.active)
+
+    def __iter__(self):
+        return iter(self.active)
+
+    def __getitem__(self, index):
+        return self.active[index]
+
+    def spawn(self):
+        """Return a live entity, reusing a despawned one if possible."""
+        obj = self.free.pop() if self.free else self.factory()
+        self.active.append(obj)
+        return obj
+
+    def despawn(self, index):
+        """Swap-remove the entity at ``index`` and keep it for reuse."""
+        active = self.active
+        obj = active[index]
+        last = active.pop()
+        if index < len(active):
+            active[index] = last
+        self.free.append(obj)
+
+    def clear(self):
+        """Despawn every live entity."""
+        self.free.extend(self.active)
+        self.active.clear()
@@ -1,39 +1,131 @@
 import pygame
+import argparse
+import atexit
 import random
 import sys
 import os
-import math
-import wave
-import struct
 import webbrowser
-
-# Initialize pygame
-pygame.init()
-try:
-    pygame.mixer.init()
-    pygame.mixer.set_num_channels(32)
-except pygame.error:
-    print("Warning: audio disabled")
+import functools
+import threading
+from collections import OrderedDict
+
+import bake
+from pacing import FramePacer
+from profiler import FrameProfiler
+from replay import ACTION_BUY, ACTION_SELECT, ReplayRecorder
+from sfx import SfxManager
+from soundcache import SoundCache
+import synth
+import textures
+from simulation import (
+    BACKGROUND_PRICE,
+    FRAME_RATE,
+    GameConfig,
+    GameState,
+    Inputs,
+    finish_level,
+    level_settings,
+    start_level,
+    step,
+)
 
 GAME_WIDTH = 800
 ASSET_DIR = os.path.join(os.path.dirname(__file__), "assets")
-
-# Determine the user's screen resolution and go fullscreen
-display_info = pygame.display.Info()
-SCREEN_WIDTH, SCREEN_HEIGHT = display_info.current_w, display_info.current_h
 WIDTH = GAME_WIDTH
-HEIGHT = SCREEN_HEIGHT
-
-# Side panel sizes for shop and ads
-LEFT_PANEL_WIDTH = max(200, (SCREEN_WIDTH - GAME_WIDTH) // 2)
-RIGHT_PANEL_WIDTH = SCREEN_WIDTH - GAME_WIDTH - LEFT_PANEL_WIDTH
 
 # Drop-down sizing for the shop panel
 SHOP_DD_HEIGHT = 24
 SHOP_OPTION_HEIGHT = 24
 
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
-pygame.display.set_caption("Ninja vs Zombies")
+# Screen globals are filled in by ``init``. Importing this module does no
+# pygame work, so tools and benchmarks can import it without a display.
+screen = None
+SCREEN_WIDTH = SCREEN_HEIGHT = HEIGHT = 0
+LEFT_PANEL_WIDTH = RIGHT_PANEL_WIDTH = 0
+# Horizontal offset where the playable area begins on the screen
+GAME_ORIGIN_X = 0
+# Whether SDL scales the screen to the window (``pygame.SCALED``)
+DISPLAY_SCALED = False
+
+
+# The game is drawn at a logical resolution that SDL scales to the display
+# (``pygame.SCALED``), so frame cost and the map's shape do not depend on
+# taller monitors. ``RENDER_SIZE`` fixes it and ``RENDER_SCALE`` makes it
+# that fraction of the display; by default it is ``RENDER_HEIGHT`` rows at
+# the display's aspect ratio, or the native size on shorter displays. The
+# trade-off: a scaled display always uploads and presents whole frames, so
+# dirty rects only save drawing, not the display update.
+RENDER_SIZE = None
+RENDER_SCALE = None
+RENDER_HEIGHT = 1080
+# Narrowest logical width that fits the play area and both side panels
+MIN_PANEL_WIDTH = 200
+MIN_RENDER_WIDTH = GAME_WIDTH + 2 * MIN_PANEL_WIDTH
+
+
+def render_size(native, size=None, scale=None, height=RENDER_HEIGHT):
+    """Return the logical resolution to draw at for a ``native`` display.
+
+    ``height`` is capped at the native height, and ``None`` draws at the
+    native size, when neither ``size`` nor ``scale`` is given. The width is widened to ``MIN_RENDER_WIDTH``
+    if needed; SDL letterboxes the result.
+    """
+    if size:
+        width, height = size
+    elif scale:
+        width, height = round(native[0] * scale), round(native[1] * scale)
+    elif height:
+        height = min(height, native[1])
+        width = round(native[0] * height / native[1])
+    else:
+        width, height = native
+    return (max(width, MIN_RENDER_WIDTH), height)
+
+
+def init_display(size=None, fullscreen=True, vsync=False, scaled=False):
+    """Open the game window, by default fullscreen at the desktop size.
+
+    Gameplay is laid out for the logical resolution from ``render_size``.
+    An explicit window ``size`` is drawn at its own resolution unless
+    ``RENDER_SIZE`` or ``RENDER_SCALE`` says otherwise.
+    When that differs from the window, with ``vsync`` or with ``scaled``
+    (both need the ``SCALED`` renderer), the window is opened with
+    ``pygame.SCALED``; if the driver refuses, the game is drawn at the
+    window size instead.
+    """
+    global screen, SCREEN_WIDTH, SCREEN_HEIGHT, HEIGHT
+    global LEFT_PANEL_WIDTH, RIGHT_PANEL_WIDTH, GAME_ORIGIN_X, DISPLAY_SCALED
+    pygame.display.init()
+    height = None
+    if size is None:
+        display_info = pygame.display.Info()
+        size = (display_info.current_w, display_info.current_h)
+        height = RENDER_HEIGHT
+    logical = render_size(size, RENDER_SIZE, RENDER_SCALE, height)
+
+    flags = pygame.FULLSCREEN if fullscreen else 0
+    screen = None
+    DISPLAY_SCALED = False
+    if logical != tuple(size) or vsync or scaled:
+        try:
+            screen = pygame.display.set_mode(logical, flags | pygame.SCALED, vsync=int(vsync))
+            DISPLAY_SCALED = True
+        except pygame.error:
+            print("Warning: scaled rendering unavailable")
+    if screen is None:
+        screen = pygame.display.set_mode(size, flags)
+
+    # Gameplay bounds follow the logical resolution
+    SCREEN_WIDTH, SCREEN_HEIGHT = screen.get_size()
+    HEIGHT = SCREEN_HEIGHT
+
+    # Side panel sizes for shop and ads
+    LEFT_PANEL_WIDTH = max(MIN_PANEL_WIDTH, (SCREEN_WIDTH - GAME_WIDTH) // 2)
+    RIGHT_PANEL_WIDTH = SCREEN_WIDTH - GAME_WIDTH - LEFT_PANEL_WIDTH
+    GAME_ORIGIN_X = LEFT_PANEL_WIDTH
+
+    pygame.display.set_caption("Ninja vs Zombies")
+    return screen
 
 
 def ensure_directories():
@@ -47,20 +139,6 @@ def generate_image(path, draw_func):
     pygame.image.save(surface, path)
 
 
-def generate_sound(path, frequency, duration):
-    sample_rate = 44100
-    amplitude = 32767
-    frames = []
-    for i in range(int(duration * sample_rate)):
-        value = int(amplitude * math.sin(2 * math.pi * frequency * i / sample_rate))
-        frames.append(struct.pack("<h", value))
-    with wave.open(path, "w") as wav:
-        wav.setnchannels(1)
-        wav.setsampwidth(2)
-        wav.setframerate(sample_rate)
-        wav.writeframes(b"".join(frames))
-
-
 def draw_gradient_border(surface, rect, width):
     """Draw a black to white gradient border around ``rect``."""
     for i in range(width):
@@ -100,74 +178,135 @@ def ensure_assets():
 
 
     if pygame.mixer.get_init():
-        # Custom sound effects are now included with the project so we no longer
-        # generate placeholder sounds. Any required files should be placed under
-        # ``assets/sounds`` beforehand.
+        # Custom sound effects are included with the project; any that are
+        # missing are synthesised in memory by ``load_sounds`` instead of
+        # being generated here.
         pass
 
 
-class Zombie(pygame.sprite.Sprite):
-    """Animated zombie enemy using 3x4 sprite sheets."""
-
-    def __init__(self, spritesheet_path):
-        super().__init__()
-        self.sprite_sheet = pygame.image.load(spritesheet_path).convert_alpha()
-        # Determine frame dimensions from the sheet itself (3 columns x 4 rows)
-        sheet_w, sheet_h = self.sprite_sheet.get_size()
-        self.frames_per_direction = 3
-        self.frame_width = sheet_w // self.frames_per_direction
-        self.frame_height = sheet_h // 4
-        # Sprite sheet rows are ordered: down, right, up, left
-        self.directions = {
-            "down": 0,
-            "right": 1,
-            "up": 2,
-            "left": 3,
-        }
-
-        self.direction = "down"
-        self.current_frame = 0
-        self.animation_timer = 0
-        # Slightly slower animation for smoother movement
-        self.animation_speed = 0.2  # seconds per frame
-
-        self.image = self.get_frame()
-        self.rect = self.image.get_rect()
-
-    def get_frame(self):
-        row = self.directions[self.direction]
-        col = self.current_frame % self.frames_per_direction
-        x = col * self.frame_width
-        y = row * self.frame_height
-        frame = pygame.Surface((self.frame_width, self.frame_height), pygame.SRCALPHA)
-        frame.blit(
-            self.sprite_sheet,
-            (0, 0),
-            pygame.Rect(x, y, self.frame_width, self.frame_height),
-        )
-        scaled = pygame.transform.scale(
-            frame,
-            (
-                int(self.frame_width * ZOMBIE_SCALE),
-                int(self.frame_height * ZOMBIE_SCALE),
-            ),
-        )
-        return scaled
-
-    def update(self, dt):
-        self.animation_timer += dt
-        if self.animation_timer >= self.animation_speed:
-            self.animation_timer = 0
-            self.current_frame = (self.current_frame + 1) % self.frames_per_direction
-            self.image = self.get_frame()
-
-    def set_direction(self, new_direction):
-        if new_direction in self.directions and new_direction != self.direction:
-            self.direction = new_direction
-            self.current_frame = 0
-            self.image = self.get_frame()
-
-
+class ZombieAtlas:
+    """Pre-sliced, pre-scaled frames for every zombie sprite sheet.
+
+    Each 3x4 sheet is decoded once and cut into ``frames[sheet][row][col]``
+    surfaces at ``scale`` so zombies never touch the disk or allocate new
+    surfaces while spawning or animating.
+    """
+
+    frames_per_direction = 3
+    # Sprite sheet rows are ordered: down, right, up, left
+    directions = {
+        "down": 0,
+        "right": 1,
+        "up": 2,
+        "left": 3,
+    }
+
+    def __init__(self, frames, frame_width, frame_height):
+        self.frames = frames
+        # Unscaled size of the largest frame
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+
+    @classmethod
+    def load(cls, sheet_paths, scale):
+        """Decode and slice ``sheet_paths``, scaling frames by ``scale``."""
+        all_frames = []
+        frame_width = frame_height = 0
+        for path in sheet_paths:
+            sheet = pygame.image.load(path).convert_alpha()
+            sheet_w, sheet_h = sheet.get_size()
+            frame_w = sheet_w // cls.frames_per_direction
+            frame_h = sheet_h // len(cls.directions)
+            size = (int(frame_w * scale), int(frame_h * scale))
+            rows = []
+            for row in range(len(cls.directions)):
+                cols = []
+                for col in range(cls.frames_per_direction):
+                    area = pygame.Rect(col * frame_w, row * frame_h, frame_w, frame_h)
+                    cols.append(pygame.transform.scale(sheet.subsurface(area), size))
+                rows.append(cols)
+            all_frames.append(rows)
+            frame_width = max(frame_width, frame_w)
+            frame_height = max(frame_height, frame_h)
+        return cls(all_frames, frame_width, frame_height)
+
+    def __len__(self):
+        return len(self.frames)
+
+
+class RotationCache:
+    """Pre-rotated copies of sprites shared by everything that spins.
+
+    Frames are built once per ``(surface, step)`` pair for every multiple of
+    ``step`` degrees, together with the offset from their top-left corner to
+    their centre, so drawing a rotating sprite is just a lookup and a blit.
+    """
+
+    def __init__(self):
+        self._frames = {}
+
+    def frames(self, surface, step):
+        """Return ``[(image, (offset_x, offset_y)), ...]`` for ``surface``."""
+        key = (surface, step)
+        frames = self._frames.get(key)
+        if frames is None:
+            frames = []
+            for i in range(int(round(360 / step))):
+                rotated = pygame.transform.rotate(surface, i * step)
+                frames.append((rotated, (rotated.get_width() // 2, rotated.get_height() // 2)))
+            self._frames[key] = frames
+        return frames
+
+
+class GlyphCache:
+    """Pre-rendered glyphs used to compose frequently changing numbers.
+
+    Digits are rendered once; a number is then assembled by blitting its
+    glyphs side by side instead of rasterizing the whole string with the
+    TTF renderer. Static prefixes such as ``"Score: "`` are rendered once
+    per prefix.
+    """
+
+    def __init__(self, font, color, chars="0123456789-"):
+        self.font = font
+        self.color = color
+        self.glyphs = {c: font.render(c, True, color) for c in chars}
+        self.prefixes = {}
+
+    def compose(self, prefix, text):
+        prefix_surf = self.prefixes.get(prefix)
+        if prefix_surf is None:
+            prefix_surf = self.prefixes[prefix] = self.font.render(prefix, True, self.color)
+        glyphs = self.glyphs
+        if any(c not in glyphs for c in text):
+            return self.font.render(prefix + text, True, self.color)
+        width = prefix_surf.get_width() + sum(glyphs[c].get_width() for c in text)
+        surface = pygame.Surface((width, prefix_surf.get_height()), pygame.SRCALPHA)
+        surface.blit(prefix_surf, (0, 0))
+        x = prefix_surf.get_width()
+        for c in text:
+            glyph = glyphs[c]
+            # Glyphs never overlap, so MAX copies them onto the clear surface
+            surface.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            x += glyph.get_width()
+        return surface
+
+
+class Hud:
+    """HUD text that is only re-rendered when a field's value changes."""
+
+    def __init__(self, font, color=(255, 255, 255)):
+        self.glyphs = GlyphCache(font, color)
+        self.fields = {}
+
+    def text(self, name, prefix, value):
+        """Return the surface for ``prefix + str(value)`` of field ``name``."""
+        entry = self.fields.get(name)
+        if entry is not None and entry[0] == value:
+            return entry[1]
+        surface = self.glyphs.compose(prefix, str(value))
+        self.fields[name] = (value, surface)
+        return surface
 
 
 class BlueFlameFlower(pygame.sprite.Sprite):
@@ -197,55 +336,108 @@ class BlueFlameFlower(pygame.sprite.Sprite):
             self.rect = self.image.get_rect(center=center)
 
 
-ensure_assets()
-
-
-# Load images
-# Load Block Ninja sprites
-player_idle_img = pygame.image.load(
-    os.path.join(ASSET_DIR, "Block Ninja", "idle.PNG")
-)
-player_walk_imgs = [
-    pygame.image.load(os.path.join(ASSET_DIR, "Block Ninja", "walk a.PNG")),
-    pygame.image.load(os.path.join(ASSET_DIR, "Block Ninja", "walk b.PNG")),
-    pygame.image.load(os.path.join(ASSET_DIR, "Block Ninja", "walk c.PNG")),
-    pygame.image.load(os.path.join(ASSET_DIR, "Block Ninja", "walk d.PNG")),
+# Sprite source files
+player_idle_path = os.path.join(ASSET_DIR, "Block Ninja", "idle.PNG")
+player_walk_paths = [
+    os.path.join(ASSET_DIR, "Block Ninja", name)
+    for name in ("walk a.PNG", "walk b.PNG", "walk c.PNG", "walk d.PNG")
+]
+shuriken_path = os.path.join(ASSET_DIR, "Block Ninja", "shuriken.PNG")
+# Coin rotation sprite sheet (6 frames horizontally)
+coin_sheet_path = os.path.join(ASSET_DIR, "coin_rot_anim.png")
+# Decoration: Blue Flame Flower animation frames
+blue_flower_paths = [
+    os.path.join(ASSET_DIR, "Decorations", "Blue Flame Flower", f"{i}.png")
+    for i in range(1, 5)
 ]
 # Zombie sprite sheets (3 columns x 4 rows)
 zombie_sheet_paths = [
     os.path.join(ASSET_DIR, "Zombies", "Zombies", f"{i}ZombieSpriteSheet.png")
     for i in range(1, 7)
 ]
+SPRITE_SOURCES = [
+    player_idle_path,
+    *player_walk_paths,
+    shuriken_path,
+    coin_sheet_path,
+    *blue_flower_paths,
+    *zombie_sheet_paths,
+]
 
-# Coin rotation sprite sheet (6 frames horizontally)
-coin_sheet = pygame.image.load(os.path.join(ASSET_DIR, "coin_rot_anim.png")).convert_alpha()
-coin_frame_size = coin_sheet.get_height()
+# Scale factor for zombie size (increased for larger zombies)
+ZOMBIE_SCALE = 2.0
+
+# ``bake.py`` packs the sprites into an atlas here; settings that change the
+# baked output are part of its content hash
+BAKE_DIR = os.path.join(ASSET_DIR, "baked")
+BAKE_SETTINGS = {"zombie_scale": ZOMBIE_SCALE}
+# Manifest of a current bake, read by ``init``; ``None`` uses the raw assets
+ASSET_MANIFEST = None
+
+# Sprite globals are filled in by ``load_images``
+player_idle_img = None
+player_walk_imgs = []
 coin_frames = []
-for i in range(coin_sheet.get_width() // coin_frame_size):
-    frame = pygame.Surface((coin_frame_size, coin_frame_size), pygame.SRCALPHA)
-    frame.blit(
-        coin_sheet,
-        (0, 0),
-        pygame.Rect(i * coin_frame_size, 0, coin_frame_size, coin_frame_size),
-    )
-    coin_frames.append(frame)
-shuriken_img = pygame.image.load(
-    os.path.join(ASSET_DIR, "Block Ninja", "shuriken.PNG")
-)
+shuriken_img = None
+blue_flower_frames = []
+blue_flower_scale = 1.0
+ZOMBIE_ATLAS = None
+
+
+def load_raw_sprites():
+    """Load and slice the sprites from their source files.
+
+    Returns the surfaces by name, plus the decoration scale and the unscaled
+    zombie frame size. ``bake.py`` packs this into the atlas.
+    """
+    player_idle = pygame.image.load(player_idle_path).convert_alpha()
+    coin_sheet = pygame.image.load(coin_sheet_path).convert_alpha()
+    size = coin_sheet.get_height()
+    coin = []
+    for i in range(coin_sheet.get_width() // size):
+        frame = pygame.Surface((size, size), pygame.SRCALPHA)
+        frame.blit(coin_sheet, (0, 0), pygame.Rect(i * size, 0, size, size))
+        coin.append(frame)
+    blue_flower = [pygame.image.load(path).convert_alpha() for path in blue_flower_paths]
+    zombies = ZombieAtlas.load(zombie_sheet_paths, ZOMBIE_SCALE)
+    return {
+        "player_idle": player_idle,
+        "player_walk": [pygame.image.load(path).convert_alpha() for path in player_walk_paths],
+        "coin": coin,
+        "shuriken": pygame.image.load(shuriken_path).convert_alpha(),
+        "blue_flower": blue_flower,
+        "blue_flower_scale": (player_idle.get_width() * 0.75) / blue_flower[0].get_width(),
+        "zombies": zombies.frames,
+        "zombie_frame_size": (zombies.frame_width, zombies.frame_height),
+    }
+
+
+def load_images():
+    """Load, convert and slice every sprite used during play.
+
+    Sprites come from the baked atlas when ``ASSET_MANIFEST`` is set and
+    from the source files otherwise.
+    """
+    global player_idle_img, player_walk_imgs, coin_frames, shuriken_img
+    global blue_flower_frames, blue_flower_scale, ZOMBIE_ATLAS
+    if ASSET_MANIFEST is not None:
+        sprites = bake.load_sprites(ASSET_MANIFEST, BAKE_DIR)
+        sprites["blue_flower_scale"] = ASSET_MANIFEST["scales"]["blue_flower"]
+        sprites["zombie_frame_size"] = ASSET_MANIFEST["zombie_frame_size"]
+    else:
+        sprites = load_raw_sprites()
+    player_idle_img = sprites["player_idle"]
+    player_walk_imgs = sprites["player_walk"]
+    coin_frames = sprites["coin"]
+    shuriken_img = sprites["shuriken"]
+    blue_flower_frames = sprites["blue_flower"]
+    blue_flower_scale = sprites["blue_flower_scale"]
+    # Every zombie sheet is sliced once; all zombies share these frames
+    ZOMBIE_ATLAS = ZombieAtlas(sprites["zombies"], *sprites["zombie_frame_size"])
+
+    # Shuriken spin in 15 degree steps, so all 24 orientations are prebuilt
+    ROTATION_CACHE.frames(shuriken_img, SHURIKEN_ANGLE_STEP)
 
-# Decoration: Blue Flame Flower animation frames
-blue_flower_frames = [
-    pygame.image.load(
-        os.path.join(
-            ASSET_DIR,
-            "Decorations",
-            "Blue Flame Flower",
-            f"{i}.png",
-        )
-    ).convert_alpha()
-    for i in range(1, 5)
-]
-blue_flower_scale = (player_idle_img.get_width() * 0.75) / blue_flower_frames[0].get_width()
 
 # ---------------------------------------------------------------------------
 # Decoration factory registry
@@ -275,55 +467,100 @@ def spawn_random_decoration():
 # new decorative assets/classes are introduced.
 DECORATION_FACTORIES.append(create_blue_flame_flower)
 
-# Load sounds
-if pygame.mixer.get_init():
-    sound_dir = os.path.join(ASSET_DIR, "sounds")
-
-    def find_sound_files(prefix):
-        paths = []
-        for root, _, files in os.walk(sound_dir):
-            for name in sorted(files):
-                low = name.lower()
-                if low.startswith(prefix) and low.split(".")[-1] in ("wav", "ogg", "mp3"):
-                    paths.append(os.path.join(root, name))
-        return paths
-
-    def load_sound_variations(prefix):
-        variations = []
-        for path in find_sound_files(prefix):
-            if prefix.startswith("hit") and path.lower().endswith(".mp3"):
-                continue
-            try:
-                variations.append(pygame.mixer.Sound(path))
-            except pygame.error:
-                pass
-        return variations
-
-    # Load only single coin and swish sounds to avoid randomization issues
-    coin_sound = None
-    coin_path = os.path.join(sound_dir, "coin_sounds", "coin1.wav")
-    if os.path.exists(coin_path):
-        try:
-            coin_sound = pygame.mixer.Sound(coin_path)
-        except pygame.error:
-            pass
-
-    swish_sound = None
-    swish_path = os.path.join(sound_dir, "swishes", "swishes", "swish-1.wav")
-    if os.path.exists(swish_path):
+# ---------------------------------------------------------------------------
+# Sounds
+# ---------------------------------------------------------------------------
+# Sounds and the music track list load lazily through ``load_sounds`` the
+# first time music starts, so startup does not wait on audio decoding.
+sound_dir = os.path.join(ASSET_DIR, "sounds")
+sounds_loaded = False
+coin_sounds = []
+swish_sounds = []
+hit_sounds = []
+bg_tracks = []
+bg_track_names = []
+current_track_index = 0
+
+# Sound effects are played through SFX so bursts of events stay within a
+# fixed voice budget; ``init`` sets up the channels and ``load_sounds``
+# registers the effects
+SFX = SfxManager()
+SFX_CHANNELS = 32
+# Channels kept free for critical effects (zombie and player hits)
+SFX_RESERVED_CHANNELS = 2
+
+# Sound variation prefixes listed in the bake manifest
+SOUND_PREFIXES = ("hit", "coin", "swish")
+
+# Decoded sound effects are cached on disk as raw PCM so later runs skip
+# decoding; music streams through ``pygame.mixer.music`` and is not cached
+SOUND_CACHE = SoundCache()
+
+# Every coin and hit sound is also played at these pitches, one variation
+# picked at random per play (needs NumPy)
+PITCH_VARIATIONS = (0.94, 1.0, 1.06)
+
+
+def find_sound_files(prefix):
+    if ASSET_MANIFEST is not None and prefix in ASSET_MANIFEST["sounds"]:
+        return [os.path.join(ASSET_DIR, p) for p in ASSET_MANIFEST["sounds"][prefix]]
+    paths = []
+    for root, dirs, files in os.walk(sound_dir):
+        dirs.sort()
+        for name in sorted(files):
+            low = name.lower()
+            if low.startswith(prefix) and low.split(".")[-1] in ("wav", "ogg", "mp3"):
+                paths.append(os.path.join(root, name))
+    return paths
+
+
+def load_sound_variations(prefix):
+    """Load every sound file starting with ``prefix`` through ``SOUND_CACHE``.
+
+    A variation shipped in several formats (``hit1.mp3`` and ``hit1.ogg``)
+    is loaded once, from the first of its files that decodes.
+    """
+    variations = {}
+    for path in find_sound_files(prefix):
+        name = os.path.splitext(os.path.basename(path))[0].lower()
+        if name in variations:
+            continue
         try:
-            swish_sound = pygame.mixer.Sound(swish_path)
+            variations[name] = SOUND_CACHE.load(path)
         except pygame.error:
             pass
-
-    hit_sound_path = os.path.join(sound_dir, "5Hit_Sounds", "mp3", "hit3.mp3")
-    if os.path.exists(hit_sound_path):
-        try:
-            hit_sound = pygame.mixer.Sound(hit_sound_path)
-        except pygame.error:
-            hit_sound = None
-    else:
-        hit_sound = None
+    return list(variations.values())
+
+
+def _effect_sounds(prefix, pitches=(1.0,)):
+    """Every variation of effect ``prefix``, played at each of ``pitches``.
+
+    Without NumPy the files are used as they are. The synth preset, rendered
+    at each pitch, stands in when no file loads.
+    """
+    sounds = load_sound_variations(prefix)
+    if not synth.available():
+        return sounds
+    if not sounds:
+        return [synth.to_sound(synth.PRESETS[prefix](pitch)) for pitch in pitches]
+    return [sound if pitch == 1.0 else synth.repitch(sound, pitch) for sound in sounds for pitch in pitches]
+
+
+def load_sounds():
+    """Load the sound effects and music track list once the mixer is up."""
+    global sounds_loaded, coin_sounds, swish_sounds, hit_sounds
+    global bg_tracks, bg_track_names, current_track_index
+    if sounds_loaded or not pygame.mixer.get_init():
+        return
+    sounds_loaded = True
+
+    # Every variation is registered; ``SFX`` picks one at random per play
+    hit_sounds = _effect_sounds("hit", PITCH_VARIATIONS)
+    coin_sounds = _effect_sounds("coin", PITCH_VARIATIONS)
+    swish_sounds = _effect_sounds("swish")
+    SFX.register("hit", hit_sounds, priority=2, max_voices=4, critical=True)
+    SFX.register("coin", coin_sounds, priority=1, max_voices=3, min_interval=0.05)
+    SFX.register("swish", swish_sounds, priority=0, max_voices=3, min_interval=0.05)
 
     track_files = [
         ("8-bit Battler", "8 Bit Battler.wav"),
@@ -341,19 +578,7 @@ if pygame.mixer.get_init():
     current_track_index = 0
     if "Komiku" in bg_track_names:
         current_track_index = bg_track_names.index("Komiku")
-    if bg_tracks:
-        try:
-            pygame.mixer.music.load(bg_tracks[current_track_index])
-            pygame.mixer.music.play(-1)
-        except pygame.error:
-            pass
-else:
-    coin_sound = None
-    swish_sound = None
-    hit_sound = None
-    bg_tracks = []
-    bg_track_names = []
-    current_track_index = 0
+    apply_volume()
 
 # ---------------------------------------------------------------------------
 # Volume configuration helpers
@@ -365,21 +590,16 @@ music_volume = 100
 def apply_volume():
     """Apply current volume settings to all loaded sounds."""
     global master_volume, sfx_volume, music_volume
-    total_sfx = (master_volume / 100) * (sfx_volume / 100)
     total_music = (master_volume / 100) * (music_volume / 100)
     if pygame.mixer.get_init():
-        if coin_sound:
-            coin_sound.set_volume(total_sfx)
-        if swish_sound:
-            swish_sound.set_volume(total_sfx)
-        if hit_sound:
-            hit_sound.set_volume(total_sfx)
+        # Every effect is in the "sfx" category, which the SFX slider scales
+        SFX.set_volume(master_volume / 100)
+        SFX.set_category_volume("sfx", sfx_volume / 100)
         pygame.mixer.music.set_volume(total_music)
 
-apply_volume()
-
 def start_music():
     """Ensure background music is playing using the selected track."""
+    load_sounds()
     if pygame.mixer.get_init() and bg_tracks:
         path = bg_tracks[current_track_index]
         if not pygame.mixer.music.get_busy():
@@ -391,13 +611,11 @@ def start_music():
 
 # Helper functions to play randomized sounds without immediate repeats
 def play_coin_sound():
-    if coin_sound:
-        coin_sound.play()
+    SFX.play("coin")
 
 # Helper functions to play randomized sounds without immediate repeats
 def play_swish_sound():
-    if swish_sound:
-        swish_sound.play()
+    SFX.play("swish")
 
 # Use a dark green background for menus
 BACKGROUND_COLOR = (0, 100, 0)
@@ -406,14 +624,19 @@ BACKGROUND_COLOR = (0, 100, 0)
 # Gameplay background
 # ---------------------------------------------------------------------------
 BACKGROUND_DIR = os.path.join(ASSET_DIR, "Backgrounds")
-BACKGROUND_TILES = sorted(
-    [
+BACKGROUND_TILES = []
+
+
+def find_background_tiles():
+    """Collect the grass tiles offered in the shop."""
+    if ASSET_MANIFEST is not None:
+        BACKGROUND_TILES[:] = [os.path.join(ASSET_DIR, p) for p in ASSET_MANIFEST["backgrounds"]]
+        return
+    BACKGROUND_TILES[:] = sorted(
         os.path.join(BACKGROUND_DIR, f)
         for f in os.listdir(BACKGROUND_DIR)
         if f.startswith("ground_grass_gen") and f.endswith(".png")
-    ]
-)
-
+    )
 
 
 def background_label(index):
@@ -427,202 +650,453 @@ unlocked_backgrounds = {0}
 def build_background(index):
     """Load the indexed tile and build a tiling surface for the play area."""
     path = BACKGROUND_TILES[index]
-    raw = pygame.image.load(path).convert()
-    tile = pygame.transform.scale(raw, (_tile_size, _tile_size))
     surface = pygame.Surface((WIDTH, HEIGHT))
+    # Converting to the target's format rather than the display's keeps this
+    # safe to call from the prewarm thread
+    raw = pygame.image.load(path).convert(surface)
+    tile = pygame.transform.scale(raw, (_tile_size, _tile_size))
     for _x in range(0, WIDTH, _tile_size):
         for _y in range(0, HEIGHT, _tile_size):
             surface.blit(tile, (_x, _y))
     return surface
 
-# This will hold the rendered tile background for the playable area.
-# Initialize here so it is always defined.
-BACKGROUND_SURFACE = build_background(selected_background)
 
+class BackgroundCache:
+    """LRU cache of built backgrounds, bounded by ``budget`` bytes.
+
+    Entries are keyed by tile index and play-area size, so switching to a
+    cached background is just a lookup. ``prewarm`` builds entries on a
+    daemon thread; ``get`` waits for an entry that is already being built
+    there instead of building it twice. The most recently used entry is
+    always kept, even when it alone exceeds the budget.
+    """
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.entries = OrderedDict()
+        self.used = 0
+        self.building = {}
+        self.lock = threading.Lock()
+
+    def get(self, index):
+        """Return the background for ``index``, building it on a miss."""
+        key = (index, WIDTH, HEIGHT)
+        while True:
+            with self.lock:
+                surface = self.entries.get(key)
+                if surface is not None:
+                    self.entries.move_to_end(key)
+                    return surface
+                pending = self.building.get(key)
+                if pending is None:
+                    pending = self.building[key] = threading.Event()
+                    break
+            pending.wait()
 
-# Horizontal offset where the playable area begins on the screen
-GAME_ORIGIN_X = LEFT_PANEL_WIDTH
+        try:
+            surface = build_background(index)
+            with self.lock:
+                self.entries[key] = surface
+                self.used += surface.get_pitch() * surface.get_height()
+                while self.used > self.budget and len(self.entries) > 1:
+                    _, old = self.entries.popitem(last=False)
+                    self.used -= old.get_pitch() * old.get_height()
+        finally:
+            with self.lock:
+                del self.building[key]
+            pending.set()
+        return surface
+
+    def prewarm(self, indices):
+        """Build the given backgrounds on a daemon thread and return it."""
+        thread = threading.Thread(
+            target=lambda: [self.get(i) for i in indices],
+            name="background-prewarm",
+            daemon=True,
+        )
+        thread.start()
+        return thread
 
-player_radius = player_idle_img.get_width() // 2
-player_speed = 5
 
-projectile_radius = shuriken_img.get_width() // 2
-projectile_speed = 10
+# Memory allowed for cached backgrounds (about a dozen 800x1080 surfaces)
+BACKGROUND_CACHE_BUDGET = 48 * 1024 * 1024
+# Build the unlocked backgrounds on a worker thread during ``init``
+PREWARM_BACKGROUNDS = True
+BACKGROUND_CACHE = BackgroundCache(BACKGROUND_CACHE_BUDGET)
 
-# Scale factor for zombie size (increased for larger zombies)
-ZOMBIE_SCALE = 2.0
+# Rendered tile background for the playable area; built on first use
+BACKGROUND_SURFACE = None
+
+
+def get_background():
+    """Return the play-area background, building it the first time."""
+    global BACKGROUND_SURFACE
+    if BACKGROUND_SURFACE is None:
+        BACKGROUND_SURFACE = BACKGROUND_CACHE.get(selected_background)
+    return BACKGROUND_SURFACE
 
-# Determine enemy sprite size from a sample zombie sheet
-sample_sheet = pygame.image.load(zombie_sheet_paths[0])
-enemy_frame_w = sample_sheet.get_width() // 3
-enemy_frame_h = sample_sheet.get_height() // 4
-enemy_size = int(max(enemy_frame_w, enemy_frame_h) * ZOMBIE_SCALE)
-# Slightly smaller hitbox than the sprite size
-ZOMBIE_HITBOX_SCALE = 0.85
-BASE_ENEMY_SPEED = 3
-coin_size = coin_frame_size
-# Coins move slower by default
-BASE_COIN_SPEED = 2
-BASE_AMMO_INTERVAL = 4
-# Longer delay before coins respawn
-BASE_COIN_DELAY = 1.5
 
 # new color for ammo pickup/projectile ui
 AMMO_COLOR = (255, 255, 255)
-player_idle_img = player_idle_img.convert_alpha()
-player_walk_imgs = [img.convert_alpha() for img in player_walk_imgs]
-shuriken_img = shuriken_img.convert_alpha()
-clock = pygame.time.Clock()
-font = pygame.font.SysFont(None, 36)
-shop_font = pygame.font.SysFont(None, 28)
-
-# Global game state
-score = 0
-lives = 3
-next_life_score = 10
+SHURIKEN_ANGLE_STEP = 15
+ROTATION_CACHE = RotationCache()
+
+# Filled in by ``init``
+font = None
+shop_font = None
+profile_font = None
+HUD = None
+SIM_CONFIG = None
+
+# Global game state; score, lives and the level entities live in game_state
+game_state = None
 current_level = 1
 
-def check_collision(px, py, ex, ey, size, radius, scale=1.0):
-    """Collision between a circle and square with optional square scaling."""
-    circle_rect = pygame.Rect(px - radius, py - radius, radius * 2, radius * 2)
-    if scale != 1.0:
-        adj = size * scale
-        offset = (size - adj) / 2
-        square_rect = pygame.Rect(ex + offset, ey + offset, adj, adj)
-    else:
-        square_rect = pygame.Rect(ex, ey, size, size)
-    return circle_rect.colliderect(square_rect)
-
-
-def spawn_enemy(speed):
-    """Spawn an enemy from a random edge moving inwards."""
-    direction = random.choice(["down", "up", "left", "right"])
-    if direction == "down":
-        x = random.randint(0, WIDTH - enemy_size)
-        y = -enemy_size
-        dx, dy = 0, speed
-    elif direction == "up":
-        x = random.randint(0, WIDTH - enemy_size)
-        y = HEIGHT
-        dx, dy = 0, -speed
-    elif direction == "left":
-        x = WIDTH
-        y = random.randint(0, HEIGHT - enemy_size)
-        dx, dy = -speed, 0
-    else:  # right
-        x = -enemy_size
-        y = random.randint(0, HEIGHT - enemy_size)
-        dx, dy = speed, 0
-    return x, y, dx, dy, direction
-
-
-def spawn_coin(speed):
-    """Spawn a coin from a random edge moving across the screen."""
-    direction = random.choice(["down", "up", "left", "right"])
-    if direction == "down":
-        x = random.randint(0, WIDTH - coin_size)
-        y = -coin_size
-        dx, dy = 0, speed
-    elif direction == "up":
-        x = random.randint(0, WIDTH - coin_size)
-        y = HEIGHT
-        dx, dy = 0, -speed
-    elif direction == "left":
-        x = WIDTH
-        y = random.randint(0, HEIGHT - coin_size)
-        dx, dy = -speed, 0
-    else:  # right
-        x = -coin_size
-        y = random.randint(0, HEIGHT - coin_size)
-        dx, dy = speed, 0
-    return x, y, dx, dy
-
-
-def spawn_ammo():
-    """Spawn a stationary ammo pickup inside the screen."""
-    x = random.randint(projectile_radius, WIDTH - projectile_radius)
-    y = random.randint(projectile_radius, HEIGHT - projectile_radius)
-    return x, y
-
-
-def draw_left_panel(render=True):
+
+def init(size=None, fullscreen=True, audio=True):
+    """Start pygame, open the window and load the sprites.
+
+    Only the display, font and (with ``audio``) mixer subsystems are
+    initialised. Sounds, music and the play-area background load lazily on
+    first use. Calling ``init`` again just returns the existing screen.
+    """
+    global font, shop_font, profile_font, HUD, SIM_CONFIG, game_state, ASSET_MANIFEST, RENDERER
+    if screen is not None:
+        return screen
+    init_display(size, fullscreen, VSYNC, scaled=RENDER_BACKEND == "texture")
+    pygame.font.init()
+    if audio:
+        try:
+            pygame.mixer.init()
+            SFX.setup(SFX_CHANNELS, SFX_RESERVED_CHANNELS)
+        except pygame.error:
+            print("Warning: audio disabled")
+
+    ensure_assets()
+    ASSET_MANIFEST = bake.read_manifest(BAKE_DIR, ASSET_DIR, BAKE_SETTINGS)
+    find_background_tiles()
+    if PREWARM_BACKGROUNDS:
+        BACKGROUND_CACHE.prewarm(sorted(unlocked_backgrounds))
+    load_images()
+    RENDERER = create_renderer(RENDER_BACKEND)
+    font = get_font(36)
+    shop_font = get_font(28)
+    profile_font = get_font(16, "monospace")
+    HUD = Hud(font)
+
+    # Dimensions of the loaded assets as seen by the simulation core
+    SIM_CONFIG = GameConfig(
+        width=WIDTH,
+        height=HEIGHT,
+        enemy_size=int(max(ZOMBIE_ATLAS.frame_width, ZOMBIE_ATLAS.frame_height) * ZOMBIE_SCALE),
+        coin_size=coin_frames[0].get_height(),
+        player_radius=player_idle_img.get_width() // 2,
+        projectile_radius=shuriken_img.get_width() // 2,
+        zombie_sheets=len(ZOMBIE_ATLAS),
+        zombie_frames=ZombieAtlas.frames_per_direction,
+        coin_frames=len(coin_frames),
+        player_walk_frames=len(player_walk_imgs),
+    )
+    game_state = GameState(SIM_CONFIG)
+    return screen
+
+
+# Arrow keys throw shuriken in these directions
+THROW_KEYS = {
+    pygame.K_LEFT: "left",
+    pygame.K_RIGHT: "right",
+    pygame.K_UP: "up",
+    pygame.K_DOWN: "down",
+}
+
+
+def play_event_sounds(events):
+    """Play the sounds for events reported by the last simulation step."""
+    for event in events:
+        if event == "hit":
+            SFX.play("hit")
+        elif event == "coin":
+            play_coin_sound()
+        elif event == "swish":
+            play_swish_sound()
+
+
+# Pre-rendered side panels, rebuilt only when what they show changes
+_left_panel_cache = {}
+_shop_panel_cache = {}
+
+
+def _render_left_panel(width, height):
+    surface = pygame.Surface((max(0, width), height))
+    panel = pygame.Rect(0, 0, width, height)
+    pygame.draw.rect(surface, (30, 30, 30), panel)
+    draw_gradient_border(surface, panel, 8)
+
+    about_rect = pygame.Rect(10, 10, panel.width - 20, 30)
+    pygame.draw.rect(surface, (80, 80, 80), about_rect)
+    txt = font.render("About", True, (255, 255, 255))
+    surface.blit(txt, txt.get_rect(center=about_rect.center))
+    return surface
+
+
+def draw_left_panel(render=True, surface=None):
     """Draw the left panel and return the panel and about button rect."""
+    surface = surface or screen
     panel = pygame.Rect(0, 0, LEFT_PANEL_WIDTH, HEIGHT)
+    about_rect = pygame.Rect(10, 10, panel.width - 20, 30)
     if render:
-        pygame.draw.rect(screen, (30, 30, 30), panel)
-        draw_gradient_border(screen, panel, 8)
-
-        about_rect = pygame.Rect(10, 10, panel.width - 20, 30)
-        pygame.draw.rect(screen, (80, 80, 80), about_rect)
-        txt = font.render("About", True, (255, 255, 255))
-        screen.blit(txt, txt.get_rect(center=about_rect.center))
-    else:
-        about_rect = pygame.Rect(10, 10, panel.width - 20, 30)
+        key = panel.size
+        cached = _left_panel_cache.get(key)
+        if cached is None:
+            _left_panel_cache.clear()
+            cached = _left_panel_cache[key] = _render_left_panel(*key)
+        surface.blit(cached, panel)
 
     return panel, about_rect
 
 
-def draw_shop(dropdown_open):
-    """Render the shop panel and return list of option rects."""
-    panel = pygame.Rect(LEFT_PANEL_WIDTH + WIDTH, 0, RIGHT_PANEL_WIDTH, HEIGHT)
-    pygame.draw.rect(screen, (40, 40, 40), panel)
-    draw_gradient_border(screen, panel, 8)
+@functools.lru_cache(maxsize=None)
+def get_font(size, name=None):
+    """Return the shared ``SysFont`` for ``name`` and ``size``.
 
-    title = font.render("Shop", True, (255, 255, 255))
-    screen.blit(title, (panel.x + 10, 10))
+    Creating a ``SysFont`` looks the font up and loads it from disk, so
+    every screen shares one instance per font.
+    """
+    return pygame.font.SysFont(name, size)
 
-    bg_label = shop_font.render("Background", True, (255, 255, 255))
-    screen.blit(bg_label, (panel.x + 10, 40))
 
-    dd_rect = pygame.Rect(panel.x + 10, 60, panel.width - 20, SHOP_DD_HEIGHT)
-    pygame.draw.rect(screen, (80, 80, 80), dd_rect)
-    current_name = background_label(selected_background)
-    txt = shop_font.render(current_name, True, (255, 255, 255))
-    screen.blit(txt, txt.get_rect(center=dd_rect.center))
+@functools.lru_cache(maxsize=None)
+def fit_shop_label(label, max_width):
+    """Render ``label`` in the shop font, ellipsized to fit ``max_width``."""
+    display = label
+    surf = shop_font.render(display, True, (255, 255, 255))
+    while surf.get_width() > max_width and len(display) > 0:
+        display = display[:-1]
+        surf = shop_font.render(display + "...", True, (255, 255, 255))
+    if display != label:
+        display += "..."
+        surf = shop_font.render(display, True, (255, 255, 255))
+    return surf
+
 
+def shop_rects(dropdown_open):
+    """Return the shop panel, dropdown and (if open) option rects on screen."""
+    panel = pygame.Rect(LEFT_PANEL_WIDTH + WIDTH, 0, RIGHT_PANEL_WIDTH, HEIGHT)
+    dd_rect = pygame.Rect(panel.x + 10, 60, panel.width - 20, SHOP_DD_HEIGHT)
     option_rects = []
     if dropdown_open:
         for i, _ in enumerate(BACKGROUND_TILES):
-            rect = pygame.Rect(
+            option_rects.append(pygame.Rect(
                 dd_rect.x,
                 dd_rect.bottom + i * SHOP_OPTION_HEIGHT,
                 dd_rect.width,
                 SHOP_OPTION_HEIGHT,
-            )
-            pygame.draw.rect(screen, (60, 60, 60), rect)
-            label = background_label(i)
-            if i not in unlocked_backgrounds:
-                label += " (10)"
-            display = label
-            surf = shop_font.render(display, True, (255, 255, 255))
-            while surf.get_width() > rect.width - 6 and len(display) > 0:
-                display = display[:-1]
-                surf = shop_font.render(display + "...", True, (255, 255, 255))
-            if display != label:
-                display += "..."
-                surf = shop_font.render(display, True, (255, 255, 255))
-            screen.blit(surf, surf.get_rect(center=rect.center))
-            option_rects.append(rect)
+            ))
+    return panel, dd_rect, option_rects
+
+
+def _render_shop_panel(dropdown_open):
+    screen_panel, screen_dd, screen_options = shop_rects(dropdown_open)
+    # Draw in panel-local coordinates so the result can be blitted anywhere
+    offset = (-screen_panel.x, 0)
+    panel = screen_panel.move(offset)
+    surface = pygame.Surface((max(0, panel.width), panel.height))
+    pygame.draw.rect(surface, (40, 40, 40), panel)
+    draw_gradient_border(surface, panel, 8)
+
+    title = font.render("Shop", True, (255, 255, 255))
+    surface.blit(title, (panel.x + 10, 10))
+
+    bg_label = shop_font.render("Background", True, (255, 255, 255))
+    surface.blit(bg_label, (panel.x + 10, 40))
+
+    dd_rect = screen_dd.move(offset)
+    pygame.draw.rect(surface, (80, 80, 80), dd_rect)
+    current_name = background_label(selected_background)
+    txt = shop_font.render(current_name, True, (255, 255, 255))
+    surface.blit(txt, txt.get_rect(center=dd_rect.center))
+
+    for i, screen_rect in enumerate(screen_options):
+        rect = screen_rect.move(offset)
+        pygame.draw.rect(surface, (60, 60, 60), rect)
+        label = background_label(i)
+        if i not in unlocked_backgrounds:
+            label += f" ({BACKGROUND_PRICE})"
+        surf = fit_shop_label(label, rect.width - 6)
+        surface.blit(surf, surf.get_rect(center=rect.center))
+    return surface
+
+
+def draw_shop(dropdown_open, surface=None):
+    """Render the shop panel and return list of option rects."""
+    surface = surface or screen
+    panel, dd_rect, option_rects = shop_rects(dropdown_open)
+    key = (panel.size, selected_background, tuple(sorted(unlocked_backgrounds)))
+    cached = _shop_panel_cache.get(dropdown_open)
+    if cached is None or cached[0] != key:
+        cached = _shop_panel_cache[dropdown_open] = (key, _render_shop_panel(dropdown_open))
+    surface.blit(cached[1], panel)
 
     return dd_rect, option_rects
 
 
+def shop_select(index):
+    """Buy background ``index`` if needed and switch to it.
+
+    Returns ``False`` when the background is locked and unaffordable.
+    """
+    global selected_background, BACKGROUND_SURFACE
+    if index not in unlocked_backgrounds:
+        if game_state.score < BACKGROUND_PRICE:
+            return False
+        game_state.score -= BACKGROUND_PRICE
+        unlocked_backgrounds.add(index)
+        record_action(ACTION_BUY, index)
+    selected_background = index
+    BACKGROUND_SURFACE = BACKGROUND_CACHE.get(selected_background)
+    record_action(ACTION_SELECT, index)
+    return True
+
+
+def prewarm_shop():
+    """Start building every background the player can buy right now.
+
+    Called when the score reaches ``BACKGROUND_PRICE`` and when the shop
+    opens, so ``shop_select`` finds a purchase already built instead of
+    building it on the main thread.
+    """
+    if game_state.score < BACKGROUND_PRICE:
+        return
+    locked = [i for i in range(len(BACKGROUND_TILES)) if i not in unlocked_backgrounds]
+    if locked:
+        BACKGROUND_CACHE.prewarm(locked)
+
+
+PAUSE_OPTIONS = ["Master", "SFX", "Music"]
+PAUSE_TRACK_LEN = 240
+PAUSE_LABEL_OFFSET = 100  # space between labels and sliders
+
+
+def pause_menu_rects():
+    """Return the exit button and music dropdown rects of the pause menu."""
+    exit_rect = pygame.Rect(0, 0, 200, 50)
+    exit_rect.center = (SCREEN_WIDTH // 2, HEIGHT // 2 + 220)
+    dropdown_rect = pygame.Rect(SCREEN_WIDTH // 2 - 150, HEIGHT // 2 - 240, 300, 40)
+    return exit_rect, dropdown_rect
+
+
+def pause_track_rect(i):
+    """Return the track rect of pause menu slider ``i``."""
+    return pygame.Rect(SCREEN_WIDTH // 2 - PAUSE_TRACK_LEN // 2, HEIGHT // 2 - 80 + i * 80, PAUSE_TRACK_LEN, 8)
+
+
+def pause_slider_rect(i):
+    """Return the area covered by slider ``i``, its label and its handle."""
+    track = pause_track_rect(i)
+    return pygame.Rect(
+        track.x - PAUSE_LABEL_OFFSET, track.y - 15, PAUSE_LABEL_OFFSET + track.width + 11, 40
+    )
+
+
+def draw_pause_slider(i, value, selected):
+    track = pause_track_rect(i)
+    label = font.render(PAUSE_OPTIONS[i], True, (255, 255, 255))
+    screen.blit(label, (track.x - PAUSE_LABEL_OFFSET, track.y - 15))
+    pygame.draw.rect(screen, (80, 80, 80), track)
+    handle_x = track.x + int((value / 100) * track.width)
+    color = (200, 0, 0) if selected else (200, 200, 200)
+    pygame.draw.circle(screen, color, (handle_x, track.centery), 10)
+
+
+def draw_pause_menu(shop_open, dropdown_open, selected, values):
+    """Render the pause menu with the given slider ``values``.
+
+    Returns a copy of the menu without the sliders, used to redraw single
+    sliders later.
+    """
+    exit_rect, dropdown_rect = pause_menu_rects()
+    screen.fill(BACKGROUND_COLOR)
+    screen.blit(get_background(), (GAME_ORIGIN_X, 0))
+    draw_left_panel()
+    draw_shop(shop_open)
+    title = font.render("Paused", True, (255, 255, 255))
+    screen.blit(title, title.get_rect(center=(SCREEN_WIDTH // 2, HEIGHT // 4)))
+
+    pygame.draw.rect(screen, (80, 80, 80), dropdown_rect)
+    current_name = "No Tracks" if not bg_tracks else bg_track_names[current_track_index][:20]
+    text_surf = font.render(current_name, True, (255, 255, 255))
+    screen.blit(text_surf, text_surf.get_rect(center=dropdown_rect.center))
+    if dropdown_open:
+        for i, name in enumerate(bg_track_names):
+            rect = pygame.Rect(dropdown_rect.x, dropdown_rect.bottom + i * 40, dropdown_rect.width, 40)
+            pygame.draw.rect(screen, (60, 60, 60), rect)
+            lbl = font.render(name[:20], True, (255, 255, 255))
+            screen.blit(lbl, lbl.get_rect(center=rect.center))
+
+    prompt = font.render("Esc to Resume", True, (255, 255, 255))
+    screen.blit(prompt, prompt.get_rect(center=(SCREEN_WIDTH // 2, HEIGHT * 3 // 4)))
+
+    pygame.draw.rect(screen, (150, 0, 0), exit_rect)
+    exit_text = font.render("Exit Game", True, (255, 255, 255))
+    screen.blit(exit_text, exit_text.get_rect(center=exit_rect.center))
+
+    base = screen.copy()
+    for i, value in enumerate(values):
+        draw_pause_slider(i, value, i == selected)
+    return base
+
+
+def wait_events(timeout=0):
+    """Block until an event arrives and return it with any others pending.
+
+    Menus use this instead of polling every frame so they sleep while
+    nothing happens. ``timeout`` (ms, 0 for none) bounds the wait for menus
+    that animate; an empty list means it expired.
+    """
+    event = pygame.event.wait(timeout)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event, *pygame.event.get()]
+
+
 def pause_menu(shop_open):
-    """Display a simple pause/options menu and adjust audio settings."""
+    """Display a simple pause/options menu and adjust audio settings.
+
+    The menu is drawn once and then sleeps until an event arrives. Slider
+    changes redraw just the affected sliders; anything else redraws the
+    whole menu.
+    """
     global master_volume, sfx_volume, music_volume, current_track_index
-    global selected_background, unlocked_backgrounds, BACKGROUND_SURFACE, score
     selected = 0
-    options = ["Master", "SFX", "Music"]
     values = [master_volume, sfx_volume, music_volume]
-    track_len = 240
-    label_offset = 100  # space between labels and sliders
-    exit_rect = pygame.Rect(0, 0, 200, 50)
-    exit_rect.center = (SCREEN_WIDTH // 2, HEIGHT // 2 + 220)
-    dropdown_rect = pygame.Rect(SCREEN_WIDTH // 2 - 150, HEIGHT // 2 - 240, 300, 40)
+    exit_rect, dropdown_rect = pause_menu_rects()
     dropdown_open = False
     dragging = None
+    full_redraw = True
+    dirty_sliders = set()
+    base = None
+    resume = False
+
+    while not resume:
+        # Sliders are redrawn from ``base`` unless something may overlap them
+        if dirty_sliders and (dropdown_open or PROFILER.enabled):
+            full_redraw = True
+        if full_redraw:
+            base = draw_pause_menu(shop_open, dropdown_open, selected, values)
+            if PROFILER.enabled:
+                draw_profiler()
+            RENDERER.present()
+            full_redraw = False
+        elif dirty_sliders:
+            rects = []
+            for i in dirty_sliders:
+                rect = pause_slider_rect(i)
+                screen.blit(base, rect, rect)
+                draw_pause_slider(i, values[i], i == selected)
+                rects.append(rect)
+            RENDERER.present(rects)
+        dirty_sliders.clear()
 
-    while True:
         shop_rect = pygame.Rect(LEFT_PANEL_WIDTH + WIDTH + 10, 60, RIGHT_PANEL_WIDTH - 20, SHOP_DD_HEIGHT)
         shop_option_rects = [
             pygame.Rect(shop_rect.x, shop_rect.bottom + i * SHOP_OPTION_HEIGHT, shop_rect.width, SHOP_OPTION_HEIGHT)
@@ -635,27 +1109,34 @@ def pause_menu(shop_open):
                 pygame.Rect(dropdown_rect.x, dropdown_rect.bottom + i * 40, dropdown_rect.width, 40)
                 for i in range(len(bg_track_names))
             ]
-        for event in pygame.event.get():
+        for event in wait_events():
+            PACER.handle_event(event)
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            if event.type == pygame.VIDEOEXPOSE:
+                full_redraw = True
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    master_volume, sfx_volume, music_volume = values
-                    apply_volume()
-                    return shop_open
-                if event.key == pygame.K_UP:
-                    selected = (selected - 1) % 3
-                if event.key == pygame.K_DOWN:
-                    selected = (selected + 1) % 3
+                    resume = True
+                    break
+                if event.key == PROFILE_KEY:
+                    PROFILER.toggle()
+                    full_redraw = True
+                if event.key in (pygame.K_UP, pygame.K_DOWN):
+                    dirty_sliders.add(selected)
+                    selected = (selected + (1 if event.key == pygame.K_DOWN else -1)) % 3
+                    dirty_sliders.add(selected)
                 if event.key == pygame.K_LEFT:
                     values[selected] = max(0, values[selected] - 5)
                     master_volume, sfx_volume, music_volume = values
                     apply_volume()
+                    dirty_sliders.add(selected)
                 if event.key == pygame.K_RIGHT:
                     values[selected] = min(100, values[selected] + 5)
                     master_volume, sfx_volume, music_volume = values
                     apply_volume()
+                    dirty_sliders.add(selected)
 
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if exit_rect.collidepoint(event.pos):
@@ -667,27 +1148,23 @@ def pause_menu(shop_open):
                     except Exception:
                         pass
                 elif panel_rect.collidepoint(event.pos):
-                    master_volume, sfx_volume, music_volume = values
-                    apply_volume()
-                    return shop_open
+                    resume = True
+                    break
                 elif shop_rect.collidepoint(event.pos):
                     shop_open = not shop_open
+                    if shop_open:
+                        prewarm_shop()
+                    full_redraw = True
                 elif shop_open:
                     for i, rect in enumerate(shop_option_rects):
                         if rect.collidepoint(event.pos):
-                            if i not in unlocked_backgrounds:
-                                if score >= 10:
-                                    score -= 10
-                                    unlocked_backgrounds.add(i)
-                                else:
-                                    break
-                            if i in unlocked_backgrounds:
-                                selected_background = i
-                                BACKGROUND_SURFACE = build_background(selected_background)
-                            shop_open = False
+                            if shop_select(i):
+                                shop_open = False
+                            full_redraw = True
                             break
                 if dropdown_rect.collidepoint(event.pos):
                     dropdown_open = not dropdown_open
+                    full_redraw = True
                 elif dropdown_open:
                     for i, rect in enumerate(track_option_rects):
                         if rect.collidepoint(event.pos):
@@ -698,16 +1175,13 @@ def pause_menu(shop_open):
                             except pygame.error:
                                 pass
                             dropdown_open = False
+                            full_redraw = True
                             break
                 else:
                     for i in range(3):
-                        track = pygame.Rect(
-                            SCREEN_WIDTH // 2 - track_len // 2,
-                            HEIGHT // 2 - 80 + i * 80,
-                            track_len,
-                            8,
-                        )
+                        track = pause_track_rect(i)
                         if track.collidepoint(event.pos):
+                            dirty_sliders.update((selected, i))
                             selected = i
                             values[i] = int(max(0, min(100, (event.pos[0] - track.x) / track.width * 100)))
                             master_volume, sfx_volume, music_volume = values
@@ -718,113 +1192,493 @@ def pause_menu(shop_open):
                 if event.button == 1:
                     dragging = None
             if event.type == pygame.MOUSEMOTION and dragging is not None:
-                track = pygame.Rect(SCREEN_WIDTH // 2 - track_len // 2, HEIGHT // 2 - 80 + dragging * 80, track_len, 8)
+                track = pause_track_rect(dragging)
                 values[dragging] = int(max(0, min(100, (event.pos[0] - track.x) / track.width * 100)))
                 master_volume, sfx_volume, music_volume = values
                 apply_volume()
+                dirty_sliders.add(dragging)
+
+    master_volume, sfx_volume, music_volume = values
+    apply_volume()
+    # Restart the frame timer so the pause is not simulated on resume
+    PACER.reset()
+    return shop_open
+
+
+def draw_static(shop_open, surface=None):
+    """Draw the layers that only change on shop or background updates."""
+    surface = surface or screen
+    surface.blit(get_background(), (GAME_ORIGIN_X, 0))
+    draw_left_panel(surface=surface)
+    draw_shop(shop_open, surface)
+
+
+class RenderQueue:
+    """Sprites queued by layer and drawn with one ``Surface.blits`` per layer.
+
+    Positions are queued in play-area coordinates and shifted by
+    ``origin_x`` in ``add``, so no caller offsets individual sprites. Layers
+    are drawn in ``LAYERS`` order whatever order they were filled in.
+    """
+
+    LAYERS = ("decorations", "hud", "player", "zombies", "coins", "ammo", "shuriken")
+
+    def __init__(self):
+        self.origin_x = 0
+        self.layers = {name: [] for name in self.LAYERS}
+
+    def add(self, layer, sprites):
+        """Queue ``(surface, x, y)`` triples on ``layer``."""
+        ox = self.origin_x
+        self.layers[layer].extend([(surface, (x + ox, y)) for surface, x, y in sprites])
+
+    def add_rotated(self, layer, image, sprites):
+        """Queue ``image`` centred on each ``(x, y, angle)``.
+
+        ``angle`` is in degrees counter-clockwise and snapped to
+        ``SHURIKEN_ANGLE_STEP``, using the frames in ``ROTATION_CACHE``.
+        """
+        rotations = ROTATION_CACHE.frames(image, SHURIKEN_ANGLE_STEP)
+        count = len(rotations)
+        ox = self.origin_x
+        # Floor division keeps sprites crossing the left or top edge on the
+        # same pixel as truncating their screen position did
+        self.layers[layer].extend([
+            (frame, (x // 1 - fx + ox, int(y) - fy))
+            for x, y, angle in sprites
+            for frame, (fx, fy) in (rotations[int(round(angle / SHURIKEN_ANGLE_STEP)) % count],)
+        ])
+
+    def flush(self, surface, rects=None):
+        """Draw and empty every layer, appending the drawn rects to ``rects``."""
+        for name in self.LAYERS:
+            batch = self.layers[name]
+            if not batch:
+                continue
+            if rects is None:
+                surface.blits(batch, doreturn=False)
+            else:
+                rects.extend(surface.blits(batch))
+            batch.clear()
 
-        screen.fill(BACKGROUND_COLOR)
-        screen.blit(BACKGROUND_SURFACE, (GAME_ORIGIN_X, 0))
-        draw_left_panel()
-        draw_shop(shop_open)
-        title = font.render("Paused", True, (255, 255, 255))
-        screen.blit(title, title.get_rect(center=(SCREEN_WIDTH // 2, HEIGHT // 4)))
-
-        pygame.draw.rect(screen, (80, 80, 80), dropdown_rect)
-        current_name = "No Tracks" if not bg_tracks else bg_track_names[current_track_index][:20]
-        text_surf = font.render(current_name, True, (255, 255, 255))
-        screen.blit(text_surf, text_surf.get_rect(center=dropdown_rect.center))
-        track_option_rects = []
-        if dropdown_open:
-            for i, name in enumerate(bg_track_names):
-                rect = pygame.Rect(dropdown_rect.x, dropdown_rect.bottom + i * 40, dropdown_rect.width, 40)
-                pygame.draw.rect(screen, (60, 60, 60), rect)
-                lbl = font.render(name[:20], True, (255, 255, 255))
-                screen.blit(lbl, lbl.get_rect(center=rect.center))
-                track_option_rects.append(rect)
-
-        for i, (name, val) in enumerate(zip(options, values)):
-            label = font.render(name, True, (255, 255, 255))
-            y = HEIGHT // 2 - 80 + i * 80
-            screen.blit(label, (SCREEN_WIDTH // 2 - track_len // 2 - label_offset, y - 15))
-            track = pygame.Rect(SCREEN_WIDTH // 2 - track_len // 2, y, track_len, 8)
-            pygame.draw.rect(screen, (80, 80, 80), track)
-            handle_x = track.x + int((val / 100) * track.width)
-            color = (200, 0, 0) if i == selected else (200, 200, 200)
-            pygame.draw.circle(screen, color, (handle_x, track.centery), 10)
-
-
-        prompt = font.render("Esc to Resume", True, (255, 255, 255))
-        screen.blit(prompt, prompt.get_rect(center=(SCREEN_WIDTH // 2, HEIGHT * 3 // 4)))
-
-        pygame.draw.rect(screen, (150, 0, 0), exit_rect)
-        exit_text = font.render("Exit Game", True, (255, 255, 255))
-        screen.blit(exit_text, exit_text.get_rect(center=exit_rect.center))
 
+RENDER_QUEUE = RenderQueue()
+
+
+def queue_sprites(queue, state, decorations, alpha=1.0):
+    """Queue decorations, HUD and entities on ``queue`` by layer.
+
+    Moving sprites are placed ``alpha`` of the way from the previous
+    simulation tick to the current one.
+    """
+    # Frames to wind velocities back by to reach the interpolated position
+    lag = (1 - alpha) * FRAME_RATE / SIM_TICK_RATE
+    queue.origin_x = GAME_ORIGIN_X
+    queue.add("decorations", ((deco.image, deco.rect.x, deco.rect.y) for deco in decorations))
+
+    score_text = HUD.text("score", "Score: ", state.score)
+    lives_text = HUD.text("lives", "Lives: ", state.lives)
+    level_text = HUD.text("level", "Lvl ", state.level_num)
+    ammo_text = HUD.text("ammo", "Shuriken: ", state.ammo)
+    timer_text = HUD.text("timer", "", state.time_left())
+    queue.add("hud", (
+        # Score and level on the left
+        (score_text, 20, 10),
+        (level_text, 20, 40),
+        # Lives and ammo on the right
+        (lives_text, WIDTH - lives_text.get_width() - 20, 10),
+        (ammo_text, WIDTH - ammo_text.get_width() - 20, 40),
+        # Timer centered at the top
+        (timer_text, WIDTH // 2 - timer_text.get_width() // 2, 20 - timer_text.get_height() // 2),
+    ))
+
+    if state.player_moving:
+        current_img = player_walk_imgs[state.player_anim_index]
+    else:
+        current_img = player_idle_img
+    player_x = state.player_x - (state.player_x - state.prev_player_x) * (1 - alpha)
+    player_y = state.player_y - (state.player_y - state.prev_player_y) * (1 - alpha)
+    player_rect = current_img.get_rect(center=(player_x, player_y))
+    queue.add("player", ((current_img, player_rect.x, player_rect.y),))
+
+    frames = ZOMBIE_ATLAS.frames
+    directions = ZombieAtlas.directions
+    queue.add("zombies", (
+        (frames[e.sheet][directions[e.direction]][e.frame], int(e.x - e.dx * lag), int(e.y - e.dy * lag))
+        for e in state.enemies
+    ))
+    queue.add("coins", (
+        (coin_frames[c.anim_index], c.x - c.dx * lag, c.y - c.dy * lag) for c in state.coins
+    ))
+    half_w = shuriken_img.get_width() // 2
+    half_h = shuriken_img.get_height() // 2
+    queue.add("ammo", ((shuriken_img, a.x - half_w, a.y - half_h) for a in state.ammo_pickups))
+    queue.add_rotated("shuriken", shuriken_img, (
+        (p.x - p.dx * lag, p.y - p.dy * lag, p.angle) for p in state.projectiles
+    ))
+
+
+def draw_sprites(state, decorations, alpha=1.0, collect=True):
+    """Draw decorations, HUD and entities onto ``screen``.
+
+    Returns the screen rects touched, or ``None`` without ``collect``.
+    """
+    queue = RENDER_QUEUE
+    queue_sprites(queue, state, decorations, alpha)
+    if not collect:
+        queue.flush(screen)
+        return None
+    rects = []
+    queue.flush(screen, rects)
+    return rects
+
+
+def draw_level(state, decorations, shop_open, alpha=1.0):
+    """Render the play area, side panels and HUD for ``state``."""
+    draw_static(shop_open)
+    draw_sprites(state, decorations, alpha, collect=False)
+
+
+def static_key(shop_open):
+    """Key that changes whenever ``draw_static`` would draw something else."""
+    return (get_background(), selected_background, len(unlocked_backgrounds), shop_open)
+
+
+# Redraw only changed regions during play instead of flipping the whole
+# screen (software renderer only)
+USE_DIRTY_RECTS = True
+# Fall back to a full flip when the dirty rects cover more of the screen
+DIRTY_RECT_MAX_FRACTION = 0.35
+
+
+class DirtyRectRenderer:
+    """Draw level frames by pushing only the regions that changed.
+
+    The background and both side panels are rendered once into a cached
+    full-screen ``static`` layer. Each frame the rects covered by sprites on
+    the previous frame are restored from that layer, every sprite is drawn
+    again and only the previous plus current rects are sent to
+    ``pygame.display.update``. The static layer is rebuilt and the whole
+    screen flipped when the shop, the background or the screen contents
+    change underneath us (see ``invalidate``), and a plain flip is used when
+    the dirty area grows past ``max_fraction`` of the screen. On a
+    ``pygame.SCALED`` display ``update`` uploads the whole frame anyway, so
+    frames are always flipped and only the drawing is saved.
+    """
+
+    def __init__(self, max_fraction=DIRTY_RECT_MAX_FRACTION):
+        self.max_fraction = max_fraction
+        self.static = None
+        self.static_key = None
+        self.needs_flip = True
+        self.previous = []
+
+    def invalidate(self):
+        """Force a full redraw, e.g. after a menu drew over the screen."""
+        self.static_key = None
+
+    def prepare(self, shop_open):
+        """Build the static layer ahead of time, e.g. behind a loading screen.
+
+        The next ``render`` still flips the whole screen but skips the
+        rebuild.
+        """
+        self._build_static(shop_open)
+        self.needs_flip = True
+
+    def _build_static(self, shop_open):
+        if self.static is None or self.static.get_size() != screen.get_size():
+            self.static = pygame.Surface(screen.get_size()).convert()
+        draw_static(shop_open, self.static)
+        self.static_key = static_key(shop_open)
+
+    def render(self, state, decorations, shop_open, alpha=1.0, overlay=None, mark=None):
+        """Draw one frame and push it to the display.
+
+        ``overlay``, if given, is called after the sprites and returns the
+        rect it drew. ``mark`` is called with ``"render"`` before and
+        ``"flip"`` after the display update.
+        """
+        if static_key(shop_open) != self.static_key:
+            self._build_static(shop_open)
+            self.needs_flip = True
+        if self.needs_flip:
+            self.needs_flip = False
+            screen.blit(self.static, (0, 0))
+            self.previous = draw_sprites(state, decorations, alpha)
+            if overlay:
+                self.previous.append(overlay())
+            if mark:
+                mark("render")
+            pygame.display.flip()
+            if mark:
+                mark("flip")
+            return
+
+        static = self.static
+        for rect in self.previous:
+            screen.blit(static, rect, rect)
+        current = draw_sprites(state, decorations, alpha)
+        if overlay:
+            current.append(overlay())
+        dirty = self.previous + current
+        self.previous = current
+
+        area = 0
+        for rect in dirty:
+            area += rect.width * rect.height
+        width, height = screen.get_size()
+        if mark:
+            mark("render")
+        if DISPLAY_SCALED or area > self.max_fraction * width * height:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+        if mark:
+            mark("flip")
+
+    def present(self, rects=None):
+        """Show what was drawn straight onto ``screen``, e.g. by a menu.
+
+        ``rects`` limits the update to those regions.
+        """
+        if rects is None or DISPLAY_SCALED:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+
+class TextureRenderer:
+    """Draw level frames as texture copies through ``pygame._sdl2``.
+
+    Every sprite frame is uploaded once when the renderer is created and
+    the static layer whenever ``static_key`` changes, so a frame is one
+    full-screen copy plus one copy per sprite, with shuriken rotated by the
+    copy itself. Frames are drawn in full; there are no dirty rects to
+    track. ``present`` shows screens drawn onto ``screen`` instead, such as
+    the menus: pygame uploads the display surface through the same
+    renderer on ``pygame.display.flip``.
+    """
+
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.textures = textures.TextureCache(renderer)
+        self.queue = textures.TextureQueue(self.textures, RenderQueue.LAYERS)
+        self.static = None
+        self.static_texture = None
+        self.static_key = None
+        self.overlay_layer = None
+        zombie_frames = [frame for sheet in ZOMBIE_ATLAS.frames for row in sheet for frame in row]
+        self.textures.upload([
+            player_idle_img, *player_walk_imgs, *coin_frames, shuriken_img, *zombie_frames,
+        ])
+
+    def invalidate(self):
+        """Nothing to do; every frame is drawn in full."""
+
+    def prepare(self, shop_open):
+        """Upload the static layer ahead of time, e.g. behind a loading screen."""
+        self._build_static(shop_open)
+
+    def _build_static(self, shop_open):
+        if self.static is None or self.static.get_size() != screen.get_size():
+            self.static = pygame.Surface(screen.get_size()).convert()
+        draw_static(shop_open, self.static)
+        self.static_texture = textures.Texture.from_surface(self.renderer, self.static)
+        self.static_key = static_key(shop_open)
+
+    def render(self, state, decorations, shop_open, alpha=1.0, overlay=None, mark=None):
+        """Draw one frame and present it.
+
+        Arguments are as for ``DirtyRectRenderer.render``, except that
+        ``overlay`` is called with a transparent surface to draw on.
+        """
+        if static_key(shop_open) != self.static_key:
+            self._build_static(shop_open)
+        self.static_texture.draw()
+        queue_sprites(self.queue, state, decorations, alpha)
+        self.queue.flush()
+        if overlay:
+            self._draw_overlay(overlay)
+        if mark:
+            mark("render")
+        self.renderer.present()
+        if mark:
+            mark("flip")
+
+    def _draw_overlay(self, overlay):
+        if self.overlay_layer is None:
+            self.overlay_layer = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+        layer = self.overlay_layer
+        rect = overlay(layer).clip(layer.get_rect())
+        textures.Texture.from_surface(self.renderer, layer.subsurface(rect)).draw(dstrect=rect)
+        layer.fill((0, 0, 0, 0), rect)
+
+    def present(self, rects=None):
+        """Show what was drawn straight onto ``screen``, e.g. by a menu."""
         pygame.display.flip()
-        clock.tick(60)
 
 
-def run_level(level_num, enemy_speed, coin_speed, enemy_count, ammo_interval, coin_delay):
-    global master_volume, sfx_volume, music_volume
-    global score, lives, next_life_score
-    global selected_background, unlocked_backgrounds, BACKGROUND_SURFACE
-    # Ensure the background surface exists in case an older save lacked it
-    if BACKGROUND_SURFACE is None:
-        BACKGROUND_SURFACE = build_background(selected_background)
-    if pygame.mixer.get_init() and not pygame.mixer.music.get_busy():
-        start_music()
-
-    # Display level number before starting
-    screen.fill((0, 0, 0))
-    level_text = font.render(f"Level {level_num}", True, (255, 255, 255))
-    screen.blit(level_text, level_text.get_rect(center=(SCREEN_WIDTH // 2, HEIGHT // 2)))
-    pygame.display.flip()
-    pygame.time.delay(1500)
-    player_x = WIDTH // 2
-    player_y = HEIGHT // 2
-
-    player_anim_index = 0
-    player_anim_timer = 0
-    current_img = player_idle_img
-
-    enemies = []
-    for _ in range(enemy_count):
-        ex, ey, edx, edy, edir = spawn_enemy(enemy_speed)
-        eobj = Zombie(random.choice(zombie_sheet_paths))
-        eobj.set_direction(edir)
-        eobj.rect.topleft = (ex, ey)
-        enemies.append([ex, ey, edx, edy, edir, eobj])
-    enemy_spawn_count = enemy_count
-
-    coin_x, coin_y, coin_dx, coin_dy = spawn_coin(coin_speed)
-    coin_anim_index = 0
-    coin_anim_timer = 0
-    coin_active = True
-    coin_respawn_timer = 0
-
-    ammo_x, ammo_y = None, None
-
-    projectiles = []
-    ammo = 5
+# Level renderer: "software" blits onto the display surface and pushes
+# dirty rects, "texture" draws GPU textures through ``pygame._sdl2`` (SDL
+# picks its software renderer when there is no GPU). Chosen in ``init``;
+# "texture" falls back to "software" when no renderer is available.
+RENDER_BACKEND = "software"
+RENDER_BACKENDS = ("software", "texture")
+RENDERER = None
+
+
+def create_renderer(backend):
+    """Return a renderer for ``backend`` drawing to the current display."""
+    if backend == "texture":
+        renderer = textures.display_renderer()
+        if renderer is not None:
+            return TextureRenderer(renderer)
+        print("Warning: texture rendering unavailable")
+    return DirtyRectRenderer(DIRTY_RECT_MAX_FRACTION if USE_DIRTY_RECTS else 0.0)
+
+
+# Simulation ticks per second; rendering interpolates between ticks
+SIM_TICK_RATE = 60
+# Render frame rate cap, 0 for uncapped (e.g. with vsync)
+MAX_FPS = 60
+# Frame rate while the window is unfocused or minimised; play is suspended
+BACKGROUND_FPS = 5
+# Frame rate cap for loading and other non-gameplay screens
+LOW_POWER_FPS = 30
+# Synchronise flips to the display refresh (see ``init_display``)
+VSYNC = False
+PACER = FramePacer(MAX_FPS, BACKGROUND_FPS, LOW_POWER_FPS)
+# Longest frame the simulation catches up on; slower frames slow the game
+MAX_FRAME_TIME = 0.25
+
+# Frame profiler overlay, toggled with PROFILE_KEY during play or pause.
+# With ``main --profile-csv`` the profiled frames are written there on exit.
+PROFILER = FrameProfiler()
+PROFILE_KEY = pygame.K_F3
+PROFILE_CSV = None
+
+
+def draw_profiler(surface=None):
+    return PROFILER.draw(surface or screen, profile_font, (GAME_ORIGIN_X + 10, 80))
+
+
+def write_profile():
+    """Dump the profiled frames to ``PROFILE_CSV`` if set and there are any."""
+    if not PROFILE_CSV:
+        return
+    count = PROFILER.write_csv(PROFILE_CSV)
+    if count:
+        print(f"Wrote {count} profiled frames to {PROFILE_CSV}")
+
+
+# Session recorder set up by ``main --record``; ``None`` when not recording
+recorder = None
+record_path = None
+recorded_sessions = 0
+
+
+def record_action(code, arg=0):
+    if recorder:
+        recorder.action(code, arg)
+
+
+def start_recording():
+    """Reseed ``game_state`` and start recording its session."""
+    global game_state, recorder
+    seed = random.getrandbits(63)
+    game_state = GameState(SIM_CONFIG, seed=seed)
+    recorder = ReplayRecorder(seed, SIM_CONFIG, SIM_TICK_RATE)
+
+
+def save_recording():
+    """Write the current session to ``record_path``, numbering repeats."""
+    global recorder, recorded_sessions
+    if not recorder or not recorder.replay.ticks:
+        return
+    recorded_sessions += 1
+    path = record_path
+    if recorded_sessions > 1:
+        root, ext = os.path.splitext(record_path)
+        path = f"{root}-{recorded_sessions}{ext}"
+    recorder.save(path)
+    print(f"Saved replay of {len(recorder.replay)} ticks to {path}")
+    recorder = None
+
+
+# How long the "Level N" splash stays up while the level loads
+SPLASH_DURATION = 1.5
+SPLASH_FADE_TIME = 0.3
+
+
+def level_splash(level_num, tasks, duration=SPLASH_DURATION):
+    """Show the "Level N" splash while running ``tasks`` between frames.
+
+    One task runs per frame and events keep being pumped, so loading never
+    freezes the window. The splash stays up for at least ``duration``
+    seconds and until every task has run; a bar shows the progress.
+    """
+    text = font.render(f"Level {level_num}", True, (255, 255, 255))
+    text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, HEIGHT // 2))
+    bar = pygame.Rect(0, 0, 200, 4)
+    bar.midtop = (text_rect.centerx, text_rect.bottom + 16)
+    pending = list(tasks)
+    total = max(1, len(pending))
+    elapsed = 0.0
+    PACER.reset()
+    while elapsed < duration or pending:
+        for event in pygame.event.get():
+            PACER.handle_event(event)
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+        if pending:
+            pending.pop(0)()
 
-    # Spawn a small batch of decorative sprites. Using a list makes it easy to
-    # support multiple decoration types in the future.
-    decorations = [
-        spawn_random_decoration() for _ in range(random.randint(3, 5))
-    ]
+        screen.fill((0, 0, 0))
+        text.set_alpha(int(255 * min(1.0, elapsed / SPLASH_FADE_TIME)))
+        screen.blit(text, text_rect)
+        done = (total - len(pending)) / total
+        pygame.draw.rect(screen, (60, 60, 60), bar)
+        pygame.draw.rect(screen, (255, 255, 255), (bar.x, bar.y, int(bar.width * done), bar.height))
+        RENDERER.present()
+        elapsed += PACER.tick_low_power()
 
 
-    elapsed = 0
-    running = True
+def run_level(level_num, enemy_speed, coin_speed, enemy_count, ammo_interval, coin_delay):
+    state = game_state
+    # Spawn a small batch of decorative sprites. Using a list makes it easy to
+    # support multiple decoration types in the future.
+    decorations = []
+    renderer = RENDERER
     shop_open = False
-    while running:
-        dt = clock.tick(60) / 1000
+
+    def spawn_decorations():
+        decorations.extend(spawn_random_decoration() for _ in range(random.randint(3, 5)))
+
+    # Load the level behind the splash so the first frame starts immediately
+    level_splash(level_num, [
+        start_music,
+        get_background,
+        lambda: start_level(state, level_num, enemy_speed, coin_speed, enemy_count, ammo_interval, coin_delay),
+        spawn_decorations,
+        lambda: renderer.prepare(shop_open),
+    ])
+
+    inputs = Inputs()
+    tick = 1 / SIM_TICK_RATE
+    accumulator = 0.0
+    throws = []
+    was_affordable = False
+    while True:
+        frame_time = min(PACER.tick(), MAX_FRAME_TIME)
+        accumulator += frame_time
+        # Timing hooks are only passed around while the profiler is on
+        mark = PROFILER.mark if PROFILER.enabled else None
+        if mark:
+            PROFILER.begin_frame()
         for deco in decorations:
-            deco.update(dt)
-        elapsed += dt
-        if elapsed >= 60:
-            return "complete"
+            deco.update(frame_time)
 
         shop_rect = pygame.Rect(LEFT_PANEL_WIDTH + WIDTH + 10, 60, RIGHT_PANEL_WIDTH - 20, SHOP_DD_HEIGHT)
         option_rects = [
@@ -836,32 +1690,21 @@ def run_level(level_num, enemy_speed, coin_speed, enemy_count, ammo_interval, co
         panel_rect, about_rect = draw_left_panel(render=False)
 
         for event in pygame.event.get():
+            PACER.handle_event(event)
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            if event.type == pygame.VIDEOEXPOSE:
+                renderer.invalidate()
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     shop_open = pause_menu(shop_open)
-                elif event.key == pygame.K_LEFT and ammo > 0:
-                    dx = -projectile_speed
-                    projectiles.append([player_x, player_y, dx, 0, 0])
-                    ammo -= 1
-                    play_swish_sound()
-                elif event.key == pygame.K_RIGHT and ammo > 0:
-                    dx = projectile_speed
-                    projectiles.append([player_x, player_y, dx, 0, 0])
-                    ammo -= 1
-                    play_swish_sound()
-                elif event.key == pygame.K_UP and ammo > 0:
-                    dy = -projectile_speed
-                    projectiles.append([player_x, player_y, 0, dy, 0])
-                    ammo -= 1
-                    play_swish_sound()
-                elif event.key == pygame.K_DOWN and ammo > 0:
-                    dy = projectile_speed
-                    projectiles.append([player_x, player_y, 0, dy, 0])
-                    ammo -= 1
-                    play_swish_sound()
+                    renderer.invalidate()
+                elif event.key == PROFILE_KEY:
+                    PROFILER.toggle()
+                    renderer.invalidate()
+                elif event.key in THROW_KEYS:
+                    throws.append(THROW_KEYS[event.key])
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if about_rect.collidepoint(event.pos):
                     try:
@@ -869,278 +1712,133 @@ def run_level(level_num, enemy_speed, coin_speed, enemy_count, ammo_interval, co
                     except Exception:
                         pass
                     shop_open = pause_menu(shop_open)
+                    renderer.invalidate()
                 elif panel_rect.collidepoint(event.pos):
                     shop_open = pause_menu(shop_open)
+                    renderer.invalidate()
                 elif shop_rect.collidepoint(event.pos):
                     shop_open = not shop_open
+                    if shop_open:
+                        prewarm_shop()
                     shop_open = pause_menu(shop_open)
+                    renderer.invalidate()
                 elif shop_open:
                     for i, rect in enumerate(option_rects):
                         if rect.collidepoint(event.pos):
-                            if i not in unlocked_backgrounds:
-                                if score >= 10:
-                                    score -= 10
-                                    unlocked_backgrounds.add(i)
-                                else:
-                                    break
-                            if i in unlocked_backgrounds:
-                                selected_background = i
-                                BACKGROUND_SURFACE = build_background(selected_background)
-                            shop_open = False
+                            if shop_select(i):
+                                shop_open = False
                             break
 
-        keys = pygame.key.get_pressed()
-        moving = False
-        if keys[pygame.K_a]:
-            player_x -= player_speed
-            moving = True
-        if keys[pygame.K_d]:
-            player_x += player_speed
-            moving = True
-        if keys[pygame.K_w]:
-            player_y -= player_speed
-            moving = True
-        if keys[pygame.K_s]:
-            player_y += player_speed
-            moving = True
-
-        if moving:
-            player_anim_timer += 1
-            if player_anim_timer >= 10:
-                player_anim_timer = 0
-                player_anim_index = (player_anim_index + 1) % len(player_walk_imgs)
-            current_img = player_walk_imgs[player_anim_index]
-        else:
-            player_anim_timer = 0
-            current_img = player_idle_img
-
-        player_x = max(player_radius, min(WIDTH - player_radius, player_x))
-        player_y = max(player_radius, min(HEIGHT - player_radius, player_y))
-
-        # Update enemies
-        for enemy in enemies:
-            enemy[5].update(dt)
-            enemy[0] += enemy[2]
-            enemy[1] += enemy[3]
-            enemy[5].rect.topleft = (enemy[0], enemy[1])
-            if (
-                enemy[0] < -enemy_size
-                or enemy[0] > WIDTH
-                or enemy[1] < -enemy_size
-                or enemy[1] > HEIGHT
-            ):
-                enemy[0], enemy[1], enemy[2], enemy[3], enemy[4] = spawn_enemy(enemy_speed)
-                enemy[5] = Zombie(random.choice(zombie_sheet_paths))
-                enemy[5].set_direction(enemy[4])
-                enemy[5].rect.topleft = (enemy[0], enemy[1])
-                enemy_spawn_count += 1
-                if enemy_spawn_count % ammo_interval == 0 and ammo_x is None:
-                    ammo_x, ammo_y = spawn_ammo()
-
-        if coin_active:
-            coin_x += coin_dx
-            coin_y += coin_dy
-            coin_anim_timer += dt
-            if coin_anim_timer >= 0.1:
-                coin_anim_timer = 0
-                if coin_dx > 0 or coin_dy < 0:
-                    coin_anim_index = (coin_anim_index + 1) % len(coin_frames)
-                else:
-                    coin_anim_index = (coin_anim_index - 1) % len(coin_frames)
-            if (
-                coin_x < -coin_size
-                or coin_x > WIDTH
-                or coin_y < -coin_size
-                or coin_y > HEIGHT
-            ):
-                coin_active = False
-                coin_respawn_timer = coin_delay
-        else:
-            coin_respawn_timer -= dt
-            if coin_respawn_timer <= 0:
-                coin_x, coin_y, coin_dx, coin_dy = spawn_coin(coin_speed)
-                coin_anim_index = 0
-                coin_anim_timer = 0
-                coin_active = True
-
-
-        for p in projectiles[:]:
-            p[0] += p[2]
-            p[1] += p[3]
-            p[4] = (p[4] + 15) % 360
-            if (
-                p[0] < -projectile_radius
-                or p[0] > WIDTH + projectile_radius
-                or p[1] < -projectile_radius
-                or p[1] > HEIGHT + projectile_radius
-            ):
-                projectiles.remove(p)
-                continue
-            hit_any = False
-            for enemy in enemies:
-                if check_collision(
-                    p[0],
-                    p[1],
-                    enemy[0],
-                    enemy[1],
-                    enemy_size,
-                    projectile_radius,
-                    ZOMBIE_HITBOX_SCALE,
-                ):
-                    score += 1
-                    if hit_sound:
-                        hit_sound.play()
-                    enemy[0], enemy[1], enemy[2], enemy[3], enemy[4] = spawn_enemy(enemy_speed)
-                    enemy[5] = Zombie(random.choice(zombie_sheet_paths))
-                    enemy[5].set_direction(enemy[4])
-                    enemy[5].rect.topleft = (enemy[0], enemy[1])
-                    enemy_spawn_count += 1
-                    if enemy_spawn_count % ammo_interval == 0 and ammo_x is None:
-                        ammo_x, ammo_y = spawn_ammo()
-                    hit_any = True
-                    break
-            if hit_any:
-                projectiles.remove(p)
-                continue
-            if coin_active and check_collision(p[0], p[1], coin_x, coin_y, coin_size, projectile_radius):
-                score += 5
-                play_coin_sound()
-                coin_active = False
-                coin_respawn_timer = coin_delay
-                projectiles.remove(p)
-
-        for enemy in enemies:
-            if check_collision(
-                player_x,
-                player_y,
-                enemy[0],
-                enemy[1],
-                enemy_size,
-                player_radius,
-                ZOMBIE_HITBOX_SCALE,
-            ):
-                if hit_sound:
-                    hit_sound.play()
-                return "dead"
-
-        if coin_active and check_collision(player_x, player_y, coin_x, coin_y, coin_size, player_radius):
-            score += 1
-            play_coin_sound()
-            coin_active = False
-            coin_respawn_timer = coin_delay
-
-        if ammo_x is not None and check_collision(
-            player_x, player_y,
-            ammo_x - projectile_radius, ammo_y - projectile_radius,
-            projectile_radius * 2, player_radius
-        ):
-            ammo += 1
-            ammo_x, ammo_y = None, None
-
-        while score >= next_life_score:
-            lives += 1
-            next_life_score += 10
-
-        screen.blit(BACKGROUND_SURFACE, (GAME_ORIGIN_X, 0))
-        for deco in decorations:
-            screen.blit(deco.image, deco.rect.move(GAME_ORIGIN_X, 0))
-        panel, about_rect = draw_left_panel()
-        dd_rect, option_rects = draw_shop(shop_open)
-        score_text = font.render(f"Score: {score}", True, (255, 255, 255))
-        lives_text = font.render(f"Lives: {lives}", True, (255, 255, 255))
-        level_text = font.render(f"Lvl {level_num}", True, (255, 255, 255))
-        ammo_text = font.render(f"Shuriken: {ammo}", True, (255, 255, 255))
-        timer_text = font.render(f"{int(60 - elapsed)}", True, (255, 255, 255))
-
-        # Score and level on the left
-        screen.blit(score_text, (GAME_ORIGIN_X + 20, 10))
-        screen.blit(level_text, (GAME_ORIGIN_X + 20, 40))
-
-        # Lives and ammo on the right
-        screen.blit(lives_text, (GAME_ORIGIN_X + WIDTH - lives_text.get_width() - 20, 10))
-        screen.blit(ammo_text, (GAME_ORIGIN_X + WIDTH - ammo_text.get_width() - 20, 40))
-
-        # Timer centered at the top
-        timer_rect = timer_text.get_rect(center=(GAME_ORIGIN_X + WIDTH // 2, 20))
-        screen.blit(timer_text, timer_rect)
-        screen.blit(current_img, current_img.get_rect(center=(player_x + GAME_ORIGIN_X, player_y)))
-        for enemy in enemies:
-            rect = enemy[5].rect.move(GAME_ORIGIN_X, 0)
-            screen.blit(enemy[5].image, rect)
-        if coin_active:
-            screen.blit(coin_frames[coin_anim_index], (coin_x + GAME_ORIGIN_X, coin_y))
-        if ammo_x is not None:
-            screen.blit(shuriken_img, shuriken_img.get_rect(center=(ammo_x + GAME_ORIGIN_X, ammo_y)))
-        for p in projectiles:
-            rotated = pygame.transform.rotate(shuriken_img, p[4])
-            rect = rotated.get_rect(center=(int(p[0] + GAME_ORIGIN_X), int(p[1])))
-            screen.blit(rotated, rect)
-
-        pygame.display.flip()
+        # Unfocused or minimised: keep pumping events at the background
+        # rate but freeze the simulation and skip drawing
+        if not PACER.active:
+            accumulator = 0.0
+            renderer.invalidate()
+            continue
 
-    return "dead"
+        keys = pygame.key.get_pressed()
+        inputs.left = keys[pygame.K_a]
+        inputs.right = keys[pygame.K_d]
+        inputs.up = keys[pygame.K_w]
+        inputs.down = keys[pygame.K_s]
+        if mark:
+            mark("events")
+
+        # Advance in fixed ticks; throws are applied on the next tick
+        ticks = 0
+        while accumulator >= tick:
+            accumulator -= tick
+            inputs.throws = throws
+            throws = []
+            if recorder:
+                recorder.tick(inputs)
+            result = step(state, inputs, tick, mark)
+            ticks += 1
+            play_event_sounds(state.events)
+            if result is not None:
+                return result
+
+        affordable = state.score >= BACKGROUND_PRICE
+        if affordable and not was_affordable:
+            prewarm_shop()
+        was_affordable = affordable
+
+        alpha = accumulator / tick
+        overlay = draw_profiler if PROFILER.enabled else None
+        renderer.render(state, decorations, shop_open, alpha, overlay, mark)
+        if mark:
+            PROFILER.end_frame(state, PACER.get_fps(), ticks)
 
 
 def game_over_screen(score):
-    over_font = pygame.font.SysFont(None, 48)
-    info_font = pygame.font.SysFont(None, 36)
-
+    over_font = get_font(48)
+    info_font = get_font(36)
+    screen.fill(BACKGROUND_COLOR)
+    over_text = over_font.render("Game Over!", True, (255, 255, 255))
+    score_text = info_font.render(f"Score: {score}", True, (255, 255, 255))
+    prompt_text = info_font.render("Press R to Play Again or Q to Quit", True, (255, 255, 255))
+
+    screen.blit(over_text, over_text.get_rect(center=(SCREEN_WIDTH // 2, HEIGHT // 3)))
+    screen.blit(score_text, score_text.get_rect(center=(SCREEN_WIDTH // 2, HEIGHT // 2)))
+    screen.blit(prompt_text, prompt_text.get_rect(center=(SCREEN_WIDTH // 2, HEIGHT * 2 // 3)))
+    RENDERER.present()
+
+    # Nothing on this screen changes, so sleep until a key is pressed
     while True:
-        for event in pygame.event.get():
+        for event in wait_events():
+            PACER.handle_event(event)
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            if event.type == pygame.VIDEOEXPOSE:
+                RENDERER.present()
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:
                     return True
                 if event.key == pygame.K_q:
                     return False
 
-        screen.fill(BACKGROUND_COLOR)
-        over_text = over_font.render("Game Over!", True, (255, 255, 255))
-        score_text = info_font.render(f"Score: {score}", True, (255, 255, 255))
-        prompt_text = info_font.render("Press R to Play Again or Q to Quit", True, (255, 255, 255))
-
-        screen.blit(over_text, over_text.get_rect(center=(SCREEN_WIDTH // 2, HEIGHT // 3)))
-        screen.blit(score_text, score_text.get_rect(center=(SCREEN_WIDTH // 2, HEIGHT // 2)))
-        screen.blit(prompt_text, prompt_text.get_rect(center=(SCREEN_WIDTH // 2, HEIGHT * 2 // 3)))
 
-        pygame.display.flip()
-        clock.tick(60)
-
-
-def main():
-    global score, lives, next_life_score, current_level
-    enemy_speed = BASE_ENEMY_SPEED
-    coin_speed = BASE_COIN_SPEED
-    ammo_interval = BASE_AMMO_INTERVAL
-    coin_delay = BASE_COIN_DELAY
+def main(argv=None):
+    global game_state, current_level, record_path, VSYNC, RENDER_SIZE, RENDER_SCALE, RENDER_BACKEND, PROFILE_CSV
+    parser = argparse.ArgumentParser(description="Ninja vs Zombies")
+    parser.add_argument("--record", metavar="PATH", help="record each game session to a replay file")
+    parser.add_argument("--fps", type=int, default=MAX_FPS, help="frame rate cap during play, 0 for uncapped")
+    parser.add_argument("--vsync", action="store_true", help="synchronise frames to the display refresh")
+    parser.add_argument("--render-size", metavar="WxH", help="draw at this logical resolution and scale it to the display")
+    parser.add_argument("--render-scale", type=float, help="draw at this fraction of the display resolution")
+    parser.add_argument("--renderer", choices=RENDER_BACKENDS, default=RENDER_BACKEND, help="draw with software blits or GPU textures")
+    parser.add_argument("--profile-csv", metavar="PATH", help="write frames profiled with F3 to this CSV file on exit")
+    args = parser.parse_args(argv)
+    VSYNC = args.vsync
+    RENDER_BACKEND = args.renderer
+    if args.render_size:
+        RENDER_SIZE = tuple(int(v) for v in args.render_size.lower().split("x"))
+    RENDER_SCALE = args.render_scale
+    PACER.target_fps = args.fps
+
+    init()
+    if args.record:
+        record_path = args.record
+        atexit.register(save_recording)
+        start_recording()
+    if args.profile_csv:
+        PROFILE_CSV = args.profile_csv
+        atexit.register(write_profile)
     while True:
-        enemy_count = 1 + (current_level - 1) // 2
-        result = run_level(current_level, enemy_speed, coin_speed, enemy_count, ammo_interval, coin_delay)
-        if result == "complete":
-            current_level += 1
-            enemy_speed *= 1.05
-            coin_speed *= 1.05
-            ammo_interval = max(1, ammo_interval * 0.95)
-            coin_delay *= 1.1
+        result = run_level(current_level, *level_settings(current_level))
+        next_level = finish_level(game_state, result)
+        if next_level is not None:
+            current_level = next_level
             continue
-        else:  # player died
-            lives -= 1
-            if lives > 0:
-                continue
-            if game_over_screen(score):
-                score = 0
-                lives = 3
-                next_life_score = 10
-                current_level = 1
-                enemy_speed = BASE_ENEMY_SPEED
-                coin_speed = BASE_COIN_SPEED
-                ammo_interval = BASE_AMMO_INTERVAL
-                coin_delay = BASE_COIN_DELAY
-                continue
-            else:
-                break
+        save_recording()
+        if game_over_screen(game_state.score):
+            game_state = GameState(SIM_CONFIG)
+            current_level = 1
+            if record_path:
+                start_recording()
+            continue
+        break
 
     pygame.quit()
 
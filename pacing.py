@@ -0,0 +1,119 @@
+"""Frame pacing: a precise frame limiter with focus-aware throttling.
+
+``FramePacer.tick`` replaces ``pygame.time.Clock.tick``. It sleeps until
+shortly before the next frame is due and then spins for the remainder, like
+``Clock.tick_busy_loop`` but without burning a core for the whole wait.
+Frame deadlines advance by exactly one interval, so the average rate stays
+on target even when individual sleeps overshoot.
+
+The pacer also tracks window focus and minimisation from the events passed
+to ``handle_event``. While the window is inactive ``tick`` runs at the much
+lower ``background_fps``, and callers check ``active`` to suspend their
+simulation. Screens that are not gameplay can ask for ``low_power_fps``
+through ``tick_low_power``.
+"""
+
+import collections
+import time
+
+import pygame
+
+# Window events that change whether the game is worth running at full rate
+_FOCUS_LOST = {getattr(pygame, "WINDOWFOCUSLOST", -1)}
+_FOCUS_GAINED = {getattr(pygame, "WINDOWFOCUSGAINED", -1)}
+_HIDDEN = {getattr(pygame, name, -1) for name in ("WINDOWMINIMIZED", "WINDOWHIDDEN")}
+_SHOWN = {getattr(pygame, name, -1) for name in ("WINDOWRESTORED", "WINDOWMAXIMIZED", "WINDOWSHOWN")}
+
+
+class FramePacer:
+    """Limit the frame rate and throttle it while the window is inactive.
+
+    ``target_fps`` of 0 leaves the rate uncapped, e.g. when vsync already
+    paces the flips. ``spin_margin`` is how long before a deadline to stop
+    sleeping and start spinning, in seconds.
+    """
+
+    def __init__(self, target_fps=60, background_fps=5, low_power_fps=30, spin_margin=0.0015):
+        self.target_fps = target_fps
+        self.background_fps = background_fps
+        self.low_power_fps = low_power_fps
+        self.spin_margin = spin_margin
+        self.focused = True
+        self.minimized = False
+        self._last = None
+        self._deadline = None
+        self._was_active = True
+        self._times = collections.deque(maxlen=30)
+
+    @property
+    def active(self):
+        """Whether the window is focused and visible."""
+        return self.focused and not self.minimized
+
+    def handle_event(self, event):
+        """Update the focus state from a pygame window event."""
+        if event.type in _FOCUS_LOST:
+            self.focused = False
+        elif event.type in _FOCUS_GAINED:
+            self.focused = True
+        elif event.type in _HIDDEN:
+            self.minimized = True
+        elif event.type in _SHOWN:
+            self.minimized = False
+
+    def reset(self):
+        """Forget the previous frame, e.g. after blocking in a menu."""
+        self._last = None
+        self._deadline = None
+
+    def tick(self, fps=None):
+        """Wait for the next frame; return the seconds since the last tick.
+
+        ``fps`` overrides ``target_fps`` for this frame. While the window is
+        inactive the rate drops to ``background_fps``. The first tick after
+        ``reset``, or after the window becomes active again, reports one
+        nominal frame instead of the time spent waiting.
+        """
+        active = self.active
+        if not active:
+            fps = self.background_fps
+        elif fps is None:
+            fps = self.target_fps
+
+        now = time.perf_counter()
+        if fps and self._deadline is not None:
+            interval = 1 / fps
+            deadline = self._deadline + interval
+            if deadline < now - interval:
+                # Too far behind to catch up; start a fresh schedule
+                deadline = now
+            self._sleep_until(deadline)
+            self._deadline = deadline
+            now = time.perf_counter()
+        else:
+            self._deadline = now
+
+        if self._last is None or (active and not self._was_active):
+            elapsed = 1 / (fps or self.target_fps or 60)
+        else:
+            elapsed = now - self._last
+        self._last = now
+        self._was_active = active
+        self._times.append(elapsed)
+        return elapsed
+
+    def tick_low_power(self):
+        """``tick`` at ``low_power_fps`` for screens other than gameplay."""
+        return self.tick(self.low_power_fps)
+
+    def get_fps(self):
+        """Average frame rate over the last 30 ticks."""
+        total = sum(self._times)
+        return len(self._times) / total if total else 0.0
+
+    def _sleep_until(self, deadline):
+        remaining = deadline - time.perf_counter() - self.spin_margin
+        if remaining > 0:
+            time.sleep(remaining)
+        while time.perf_counter() < deadline:
+            pass
@@ -0,0 +1,123 @@
+"""Per-frame phase timings with an on-screen overlay and CSV export.
+
+``FrameProfiler`` times the sections of the main loop through ``mark``
+calls: each call charges the time since the previous one to the named
+phase. The loop only passes ``mark`` around while the profiler is enabled,
+so a disabled profiler costs one truth test per section.
+"""
+
+import collections
+import csv
+import time
+
+import pygame
+
+PHASES = ("events", "player", "enemies", "coins/projectiles", "collision", "render", "flip")
+COUNTS = ("zombie_count", "shuriken_count", "coin_count")
+
+# Frame budget line drawn across the graph, in milliseconds
+TARGET_FRAME_MS = 1000 / 60
+
+
+class FrameProfiler:
+    """Rolling per-phase frame timings plus a full log for CSV export.
+
+    ``history`` frames are kept for the overlay; every frame profiled while
+    enabled is also appended to ``rows`` (up to ``max_rows``) for
+    ``write_csv``.
+    """
+
+    def __init__(self, history=240, max_rows=100_000):
+        self.enabled = False
+        self.history = collections.deque(maxlen=history)
+        self.rows = collections.deque(maxlen=max_rows)
+        self.frame = 0
+        self._phases = None
+        self._start = 0.0
+        self._last = 0.0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        return self.enabled
+
+    def begin_frame(self):
+        self._phases = dict.fromkeys(PHASES, 0.0)
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to ``phase``."""
+        now = time.perf_counter()
+        self._phases[phase] += now - self._last
+        self._last = now
+
+    def end_frame(self, state, fps, ticks):
+        """Record the frame; ``fps`` is the achieved ``clock`` rate."""
+        if self._phases is None:
+            return
+        total = time.perf_counter() - self._start
+        row = {
+            "frame": self.frame,
+            "frame_ms": total * 1000,
+            "fps": fps,
+            "ticks": ticks,
+        }
+        for phase, seconds in self._phases.items():
+            row[phase] = seconds * 1000
+        row["zombie_count"] = len(state.enemies)
+        row["shuriken_count"] = len(state.projectiles)
+        row["coin_count"] = len(state.coins)
+        self.history.append(row)
+        self.rows.append(row)
+        self.frame += 1
+        self._phases = None
+
+    def write_csv(self, path):
+        """Write every recorded frame to ``path``; return the row count."""
+        if not self.rows:
+            return 0
+        fields = ["frame", "frame_ms", "fps", "ticks", *PHASES, *COUNTS]
+        with open(path, "w", newline="") as fh:
+            writer = csv.DictWriter(fh, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(self.rows)
+        return len(self.rows)
+
+    def averages(self):
+        """Mean frame time and per-phase times over the rolling history."""
+        n = len(self.history)
+        if not n:
+            return 0.0, {}
+        frame_ms = sum(row["frame_ms"] for row in self.history) / n
+        return frame_ms, {p: sum(row[p] for row in self.history) / n for p in PHASES}
+
+    def draw(self, surface, font, pos, width=260, graph_height=60):
+        """Draw the overlay at ``pos`` and return the rect it covers."""
+        frame_ms, phases = self.averages()
+        last = self.history[-1] if self.history else None
+        lines = [f"{frame_ms:5.2f} ms  {last['fps'] if last else 0:5.1f} fps"]
+        lines.extend(f"{phase:<18}{phases.get(phase, 0.0):6.2f}" for phase in PHASES)
+        if last:
+            lines.append(
+                f"zombies {last['zombie_count']}  shuriken {last['shuriken_count']}  coins {last['coin_count']}"
+            )
+
+        line_h = font.get_linesize()
+        rect = pygame.Rect(pos, (width, graph_height + 8 + line_h * len(lines)))
+        panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+
+        # Rolling frame-time graph, scaled so two frame budgets fill it
+        scale = graph_height / (TARGET_FRAME_MS * 2)
+        budget_y = graph_height - int(TARGET_FRAME_MS * scale)
+        pygame.draw.line(panel, (90, 90, 90), (0, budget_y), (width, budget_y))
+        samples = list(self.history)[-width:]
+        for x, row in enumerate(samples):
+            h = min(graph_height, int(row["frame_ms"] * scale))
+            color = (80, 220, 80) if row["frame_ms"] <= TARGET_FRAME_MS else (230, 80, 60)
+            pygame.draw.line(panel, color, (x, graph_height), (x, graph_height - h))
+
+        y = graph_height + 4
+        for text in lines:
+            panel.blit(font.render(text, True, (255, 255, 255)), (4, y))
+            y += line_h
+        return surface.blit(panel, rect)
@@ -0,0 +1,298 @@
+"""Recording and deterministic playback of game sessions.
+
+A replay stores the session seed, the simulation config and tick rate and,
+for every simulation tick, the held movement keys, the shuriken thrown and
+any shop actions taken since the previous tick. Because the
+simulation is deterministic and runs on a fixed timestep, feeding the same
+ticks into a ``GameState`` with the same seed plays the session out again
+exactly.
+
+Files are a short header followed by a zlib compressed tick stream; an idle
+tick costs one byte before compression. ``ReplayPlayer`` re-simulates a
+replay headlessly as fast as possible and keeps periodic state snapshots so
+``seek`` only has to re-simulate from the nearest one::
+
+    python3 replay.py session.nvzr              # headless, max speed
+    python3 replay.py session.nvzr --seek 3600  # jump to tick 3600
+    python3 replay.py session.nvzr --realtime   # watch it in a window
+"""
+
+import argparse
+import copy
+import json
+import struct
+import sys
+import time
+import zlib
+
+from simulation import (
+    BACKGROUND_PRICE,
+    EDGE_DIRECTIONS,
+    GameConfig,
+    GameState,
+    Inputs,
+    finish_level,
+    level_settings,
+    start_level,
+    step,
+)
+
+MAGIC = b"NVZR"
+VERSION = 1
+_HEADER = struct.Struct("<4sBQHI")
+
+# Movement keys, in bit order of a tick's flag byte
+MOVE_KEYS = ("left", "right", "up", "down")
+_HAS_THROWS = 1 << 4
+_HAS_ACTIONS = 1 << 5
+_DIRECTION_CODES = {name: i for i, name in enumerate(EDGE_DIRECTIONS)}
+
+# Actions recorded between ticks; the argument is the background index.
+# Pausing does not affect the simulation and is not recorded; code 1 was
+# used for it by earlier recordings, which playback ignores.
+ACTION_BUY = 2
+ACTION_SELECT = 3
+
+# Ticks between the state snapshots ``ReplayPlayer`` keeps for seeking
+SNAPSHOT_INTERVAL = 600
+
+
+class Replay:
+    """A recorded session: seed, config, tick rate and per-tick input.
+
+    ``ticks`` holds ``(moves, throws, actions)`` per tick where ``moves`` is
+    the movement bit mask, ``throws`` a tuple of direction names and
+    ``actions`` a tuple of ``(code, arg)`` pairs applied before the tick.
+    """
+
+    def __init__(self, seed, config, tick_rate, ticks=None):
+        self.seed = seed
+        self.config = config
+        self.tick_rate = tick_rate
+        self.ticks = ticks if ticks is not None else []
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def to_bytes(self):
+        body = bytearray()
+        for moves, throws, actions in self.ticks:
+            flags = moves
+            if throws:
+                flags |= _HAS_THROWS
+            if actions:
+                flags |= _HAS_ACTIONS
+            body.append(flags)
+            if throws:
+                body.append(len(throws))
+                body.extend(_DIRECTION_CODES[d] for d in throws)
+            if actions:
+                body.append(len(actions))
+                for code, arg in actions:
+                    body.append(code)
+                    body.append(arg)
+        config = json.dumps(vars(self.config), sort_keys=True).encode()
+        header = _HEADER.pack(MAGIC, VERSION, self.seed, self.tick_rate, len(self.ticks))
+        return header + struct.pack("<H", len(config)) + config + zlib.compress(bytes(body), 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, seed, tick_rate, count = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a replay file")
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+        offset = _HEADER.size
+        (config_len,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        config = GameConfig(**json.loads(data[offset:offset + config_len]))
+        body = zlib.decompress(data[offset + config_len:])
+
+        ticks = []
+        pos = 0
+        for _ in range(count):
+            flags = body[pos]
+            pos += 1
+            throws = ()
+            actions = ()
+            if flags & _HAS_THROWS:
+                n = body[pos]
+                throws = tuple(EDGE_DIRECTIONS[c] for c in body[pos + 1:pos + 1 + n])
+                pos += 1 + n
+            if flags & _HAS_ACTIONS:
+                n = body[pos]
+                pos += 1
+                actions = tuple((body[pos + 2 * i], body[pos + 2 * i + 1]) for i in range(n))
+                pos += 2 * n
+            ticks.append((flags & 0x0F, throws, actions))
+        return cls(seed, config, tick_rate, ticks)
+
+    def save(self, path):
+        with open(path, "wb") as fh:
+            fh.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as fh:
+            return cls.from_bytes(fh.read())
+
+
+class ReplayRecorder:
+    """Collect ticks for a ``Replay`` while a session is played."""
+
+    def __init__(self, seed, config, tick_rate):
+        self.replay = Replay(seed, config, tick_rate)
+        self.pending = []
+
+    def action(self, code, arg=0):
+        """Record an action; it is stored with the next tick."""
+        self.pending.append((code, arg))
+
+    def tick(self, inputs):
+        """Record the ``inputs`` about to be passed to ``step``."""
+        moves = 0
+        for bit, name in enumerate(MOVE_KEYS):
+            if getattr(inputs, name):
+                moves |= 1 << bit
+        self.replay.ticks.append((moves, tuple(inputs.throws), tuple(self.pending)))
+        self.pending.clear()
+
+    def save(self, path):
+        self.replay.save(path)
+
+
+class ReplayPlayer:
+    """Re-simulate a ``Replay`` tick by tick, following the session rules.
+
+    A snapshot of the state is kept every ``snapshot_interval`` ticks the
+    first time playback passes it, so ``seek`` restores the closest earlier
+    snapshot and only re-simulates the remainder.
+    """
+
+    def __init__(self, replay, snapshot_interval=SNAPSHOT_INTERVAL):
+        self.replay = replay
+        self.dt = 1 / replay.tick_rate
+        self.snapshot_interval = snapshot_interval
+        self.snapshots = {}
+        self.inputs = Inputs()
+        self.restart()
+
+    def restart(self):
+        self.state = GameState(self.replay.config, seed=self.replay.seed)
+        start_level(self.state, 1, *level_settings(1))
+        self.tick = 0
+        self.game_over = False
+
+    @property
+    def finished(self):
+        return self.game_over or self.tick >= len(self.replay.ticks)
+
+    def step(self):
+        """Play the next tick; return the level result it produced, if any."""
+        if self.tick % self.snapshot_interval == 0 and self.tick not in self.snapshots:
+            self.snapshots[self.tick] = copy.deepcopy(self.state)
+        moves, throws, actions = self.replay.ticks[self.tick]
+        state = self.state
+        for code, _ in actions:
+            if code == ACTION_BUY:
+                state.score -= BACKGROUND_PRICE
+        inputs = self.inputs
+        inputs.left = bool(moves & 1)
+        inputs.right = bool(moves & 2)
+        inputs.up = bool(moves & 4)
+        inputs.down = bool(moves & 8)
+        inputs.throws = throws
+        result = step(state, inputs, self.dt)
+        self.tick += 1
+        if result is not None:
+            level = finish_level(state, result)
+            if level is None:
+                self.game_over = True
+            else:
+                start_level(state, level, *level_settings(level))
+        return result
+
+    def run(self, until=None):
+        """Play as fast as possible up to tick ``until`` (default: the end)."""
+        end = len(self.replay.ticks) if until is None else min(until, len(self.replay.ticks))
+        while self.tick < end and not self.game_over:
+            self.step()
+
+    def seek(self, tick):
+        """Move playback to just before ``tick``."""
+        base = max((t for t in self.snapshots if t <= tick), default=None)
+        if tick < self.tick or (base is not None and base > self.tick):
+            if base is None:
+                self.restart()
+            else:
+                self.state = copy.deepcopy(self.snapshots[base])
+                self.tick = base
+                self.game_over = False
+        self.run(tick)
+
+
+def _play_realtime(player, backend="software"):
+    """Show the replay in a window at its recorded tick rate."""
+    import pygame
+
+    import game
+
+    game.RENDER_BACKEND = backend
+    config = player.replay.config
+    width = max(game.MIN_RENDER_WIDTH, config.width + 2 * game.MIN_PANEL_WIDTH)
+    game.init(size=(width, config.height), fullscreen=False)
+    renderer = game.RENDERER
+    game.PACER.reset()
+    while not player.finished:
+        for event in pygame.event.get():
+            game.PACER.handle_event(event)
+            if event.type == pygame.QUIT:
+                return
+            if event.type == pygame.VIDEOEXPOSE:
+                renderer.invalidate()
+        # Pause playback like live play while the window is inactive
+        if not game.PACER.active:
+            renderer.invalidate()
+            game.PACER.tick()
+            continue
+        for code, arg in player.replay.ticks[player.tick][2]:
+            if code == ACTION_BUY:
+                game.unlocked_backgrounds.add(arg)
+            elif code == ACTION_SELECT:
+                game.selected_background = arg
+                game.BACKGROUND_SURFACE = game.BACKGROUND_CACHE.get(arg)
+        player.step()
+        renderer.render(player.state, [], False)
+        game.PACER.tick(player.replay.tick_rate)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="replay file to play")
+    parser.add_argument("--seek", type=int, help="jump to this tick before playing")
+    parser.add_argument("--realtime", action="store_true", help="watch the replay in a window")
+    parser.add_argument("--renderer", choices=("software", "texture"), default="software", help="level renderer for --realtime")
+    args = parser.parse_args(argv)
+
+    replay = Replay.load(args.path)
+    player = ReplayPlayer(replay)
+    start = time.perf_counter()
+    if args.seek:
+        player.seek(args.seek)
+    if args.realtime:
+        _play_realtime(player, args.renderer)
+    else:
+        player.run()
+    elapsed = time.perf_counter() - start
+    state = player.state
+    print(
+        f"{player.tick}/{len(replay)} ticks in {elapsed:.2f} s "
+        f"({player.tick / elapsed if elapsed else 0:.0f} ticks/s): "
+        f"level {state.level_num}, score {state.score}, lives {state.lives}"
+        + (", game over" if player.game_over else "")
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
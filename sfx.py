@@ -0,0 +1,151 @@
+"""Voice-limited, prioritised playback of sound effects.
+
+``SfxManager`` sits between the game and ``pygame.mixer`` so that a burst
+of events does not turn into a burst of mixer work:
+
+* a sound retriggered within its ``min_interval`` is skipped, so dozens of
+  identical events in one frame cost a single play;
+* each sound has at most ``max_voices`` channels; past that its oldest voice
+  is restarted instead of taking another channel;
+* when every channel is busy a new sound steals the oldest voice of the
+  lowest priority sound below its own priority, or is dropped;
+* ``critical`` sounds play on channels reserved with
+  ``pygame.mixer.set_reserved`` that ordinary sounds never use;
+* volume is the overall volume times a per-category volume;
+* an effect may have several variations, played at random without
+  repeating the previous one.
+"""
+
+import random
+import time
+
+import pygame
+
+
+class _Effect:
+    __slots__ = ("sounds", "category", "priority", "max_voices", "min_interval", "critical", "last_played", "last_sound", "voices")
+
+    def __init__(self, sounds, category, priority, max_voices, min_interval, critical):
+        self.sounds = sounds
+        self.category = category
+        self.priority = priority
+        self.max_voices = max_voices
+        self.min_interval = min_interval
+        self.critical = critical
+        self.last_played = None
+        self.last_sound = None
+        # ``[(channel, started), ...]`` oldest first
+        self.voices = []
+
+
+class SfxManager:
+    """Play registered sound effects within voice and channel budgets."""
+
+    def __init__(self):
+        self.effects = {}
+        self.reserved = []
+        self.channels = []
+        self.volume = 1.0
+        self.category_volumes = {}
+
+    def setup(self, num_channels=32, reserved=2):
+        """Allocate mixer channels, keeping ``reserved`` for critical sounds."""
+        if not pygame.mixer.get_init():
+            return
+        pygame.mixer.set_num_channels(num_channels)
+        reserved = pygame.mixer.set_reserved(reserved)
+        self.reserved = [pygame.mixer.Channel(i) for i in range(reserved)]
+        # ``find_channel`` may hand out reserved channels, so search these
+        self.channels = [pygame.mixer.Channel(i) for i in range(reserved, num_channels)]
+
+    def register(self, name, sound, category="sfx", priority=1, max_voices=4, min_interval=0.03, critical=False):
+        """Add ``sound`` under ``name``; ``None`` sounds are ignored.
+
+        ``sound`` may also be a list of variations of the effect.
+        """
+        sounds = [s for s in (sound if isinstance(sound, (list, tuple)) else [sound]) if s is not None]
+        if not sounds:
+            return
+        self.effects[name] = _Effect(sounds, category, priority, max_voices, min_interval, critical)
+        self._apply_volume(self.effects[name])
+
+    def set_volume(self, volume):
+        """Set the volume applied to every category (the master slider)."""
+        self.volume = volume
+        for effect in self.effects.values():
+            self._apply_volume(effect)
+
+    def set_category_volume(self, category, volume):
+        """Set the volume of the effects in ``category``, e.g. the SFX slider."""
+        self.category_volumes[category] = volume
+        for effect in self.effects.values():
+            if effect.category == category:
+                self._apply_volume(effect)
+
+    def _apply_volume(self, effect):
+        volume = self.volume * self.category_volumes.get(effect.category, 1.0)
+        for sound in effect.sounds:
+            sound.set_volume(volume)
+
+    def play(self, name, now=None):
+        """Play ``name`` if its budgets allow; return the channel used."""
+        effect = self.effects.get(name)
+        if effect is None:
+            return None
+        if now is None:
+            now = time.perf_counter()
+        if effect.last_played is not None and now - effect.last_played < effect.min_interval:
+            return None
+
+        sounds = effect.sounds
+        sound = sounds[0]
+        if len(sounds) > 1:
+            sound = random.choice([s for s in sounds if s is not effect.last_sound])
+        voices = effect.voices
+        voices[:] = [v for v in voices if v[0].get_busy() and v[0].get_sound() in sounds]
+        if len(voices) >= effect.max_voices:
+            channel = voices.pop(0)[0]
+        else:
+            channel = self._free_channel(effect)
+            if channel is None:
+                channel = self._steal(effect)
+                if channel is None:
+                    return None
+        channel.play(sound)
+        voices.append((channel, now))
+        effect.last_played = now
+        effect.last_sound = sound
+        return channel
+
+    def _free_channel(self, effect):
+        if effect.critical:
+            for channel in self.reserved:
+                if not channel.get_busy():
+                    return channel
+        for channel in self.channels:
+            if not channel.get_busy():
+                return channel
+        return None
+
+    def _steal(self, effect):
+        """Take the oldest voice of the lowest priority sound below ``effect``.
+
+        Only channels ``effect`` may play on are considered: the shared pool,
+        plus the reserved channels for critical effects.
+        """
+        allowed = self.channels + self.reserved if effect.critical else self.channels
+        victim = None
+        for other in self.effects.values():
+            if other.priority >= effect.priority:
+                continue
+            for index, (channel, started) in enumerate(other.voices):
+                if channel.get_busy() and channel in allowed:
+                    if victim is None or (other.priority, started) < (victim[0].priority, victim[2]):
+                        victim = (other, index, started)
+                    break
+        if victim is None:
+            return None
+        other, index, _ = victim
+        channel = other.voices.pop(index)[0]
+        channel.stop()
+        return channel
@@ -0,0 +1,795 @@
+"""Headless, deterministic game simulation.
+
+This module contains the game rules without any pygame display, surface or
+clock dependency. ``GameState`` holds everything that changes while playing
+and ``step`` advances it by one tick from an ``Inputs`` snapshot. All
+randomness comes from the state's own seeded ``random.Random`` so a given
+seed and input sequence always plays out the same way.
+
+``game.py`` is a thin adapter around this core: it turns pygame events into
+``Inputs``, plays the sounds named in ``GameState.events`` and draws the
+state. Tests, balancing scripts and benchmarks can drive ``step`` directly
+without opening a window.
+"""
+
+import random
+
+import vectorized
+from entities import AmmoPickup, Coin, Enemy, EntityPool, Projectile
+from spatial import SpatialHash
+
+# Speeds and the player animation are given per frame at this frame rate;
+# ``update`` scales them by ``dt`` so motion is independent of the tick rate
+FRAME_RATE = 60
+PLAYER_SPEED = 5
+PROJECTILE_SPEED = 10
+BASE_ENEMY_SPEED = 3
+# Coins move slower by default
+BASE_COIN_SPEED = 2
+BASE_AMMO_INTERVAL = 4
+# Longer delay before coins respawn
+BASE_COIN_DELAY = 1.5
+# Slightly smaller hitbox than the sprite size
+ZOMBIE_HITBOX_SCALE = 0.85
+# Seconds per zombie animation frame
+ZOMBIE_FRAME_TIME = 0.2
+# Seconds per coin animation frame
+COIN_FRAME_TIME = 0.1
+# Frames between player walk animation steps
+PLAYER_ANIM_FRAMES = 10
+# Degrees a shuriken spins per frame
+SHURIKEN_SPIN = 15
+LEVEL_DURATION = 60
+START_AMMO = 5
+START_LIVES = 3
+# Score spent to unlock a shop background
+BACKGROUND_PRICE = 10
+# Zombie count from which the "auto" backend switches to NumPy arrays
+VECTORIZE_MIN_ENEMIES = 64
+
+EDGE_DIRECTIONS = ["down", "up", "left", "right"]
+THROW_VECTORS = {
+    "left": (-1, 0),
+    "right": (1, 0),
+    "up": (0, -1),
+    "down": (0, 1),
+}
+
+
+class GameConfig:
+    """Play area and sprite dimensions the simulation needs to know about.
+
+    The defaults match the bundled assets so the simulation can run without
+    loading any images; ``game.py`` passes the measured values instead.
+    """
+
+    def __init__(
+        self,
+        width=800,
+        height=600,
+        enemy_size=82,
+        coin_size=32,
+        player_radius=44,
+        projectile_radius=44,
+        zombie_sheets=6,
+        zombie_frames=3,
+        coin_frames=6,
+        player_walk_frames=4,
+        player_speed=PLAYER_SPEED,
+        projectile_speed=PROJECTILE_SPEED,
+        hitbox_scale=ZOMBIE_HITBOX_SCALE,
+        level_duration=LEVEL_DURATION,
+        backend="auto",
+    ):
+        self.width = width
+        self.height = height
+        self.enemy_size = enemy_size
+        self.coin_size = coin_size
+        self.player_radius = player_radius
+        self.projectile_radius = projectile_radius
+        self.zombie_sheets = zombie_sheets
+        self.zombie_frames = zombie_frames
+        self.coin_frames = coin_frames
+        self.player_walk_frames = player_walk_frames
+        self.player_speed = player_speed
+        self.projectile_speed = projectile_speed
+        self.hitbox_scale = hitbox_scale
+        self.level_duration = level_duration
+        # "python", "numpy" or "auto" (NumPy for large hordes when installed)
+        self.backend = backend
+
+
+class Inputs:
+    """Player input for a single frame.
+
+    ``left``/``right``/``up``/``down`` are the held movement keys and
+    ``throws`` lists the directions of shuriken thrown this frame, in order.
+    """
+
+    __slots__ = ("left", "right", "up", "down", "throws")
+
+    def __init__(self, left=False, right=False, up=False, down=False, throws=()):
+        self.left = left
+        self.right = right
+        self.up = up
+        self.down = down
+        self.throws = throws
+
+
+class GameState:
+    """Complete mutable state of a game session.
+
+    Score and lives persist across levels while
+    ``start_level`` resets everything that belongs to a single level.
+    ``events`` collects the names of sounds triggered during the last
+    ``step`` (``"swish"``, ``"hit"`` and ``"coin"``) and ``result`` becomes
+    ``"complete"`` or ``"dead"`` once the level ends.
+    """
+
+    def __init__(self, config=None, seed=None):
+        self.config = config or GameConfig()
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        self.score = 0
+        self.lives = START_LIVES
+        self.next_life_score = 10
+
+        # Zombies and shuriken live either in object pools or, with the NumPy
+        # backend, in struct-of-arrays pools; ``start_level`` picks one
+        self.vectorized = False
+        self._object_pools = (EntityPool(Enemy), EntityPool(Projectile))
+        self._array_pools = None
+        self.enemies, self.projectiles = self._object_pools
+        self.coins = EntityPool(Coin)
+        self.ammo_pickups = EntityPool(AmmoPickup)
+
+        # Collision broad phase: grids keyed by pool index plus the integer
+        # hitboxes used by the narrow phase, rebuilt every ``collide``
+        self.enemy_grid = SpatialHash(self.config.enemy_size)
+        self.enemy_boxes = []
+        self.coin_grid = SpatialHash(self.config.enemy_size)
+        self.coin_boxes = []
+        self._candidates = set()
+
+        self.level_num = 1
+        self.enemy_speed = BASE_ENEMY_SPEED
+        self.coin_speed = BASE_COIN_SPEED
+        self.ammo_interval = BASE_AMMO_INTERVAL
+        self.coin_delay = BASE_COIN_DELAY
+
+        self.player_x = self.config.width // 2
+        self.player_y = self.config.height // 2
+        # Player position before the last ``update``, for interpolation
+        self.prev_player_x = self.player_x
+        self.prev_player_y = self.player_y
+        self.player_moving = False
+        self.player_anim_index = 0
+        self.player_anim_timer = 0
+
+        self.ammo = START_AMMO
+        self.elapsed = 0
+        self.enemy_spawn_count = 0
+        self.coin_respawn_timer = 0
+        self.events = []
+        self.result = None
+
+    def time_left(self):
+        """Whole seconds remaining on the level timer."""
+        return int(self.config.level_duration - self.elapsed)
+
+
+def level_settings(level_num):
+    """Return ``(enemy_speed, coin_speed, enemy_count, ammo_interval, coin_delay)``.
+
+    The values are built up level by level exactly like the difficulty ramp
+    in ``game.main`` so floating point results are identical.
+    """
+    enemy_speed = BASE_ENEMY_SPEED
+    coin_speed = BASE_COIN_SPEED
+    ammo_interval = BASE_AMMO_INTERVAL
+    coin_delay = BASE_COIN_DELAY
+    for _ in range(level_num - 1):
+        enemy_speed *= 1.05
+        coin_speed *= 1.05
+        ammo_interval = max(1, ammo_interval * 0.95)
+        coin_delay *= 1.1
+    enemy_count = 1 + (level_num - 1) // 2
+    return enemy_speed, coin_speed, enemy_count, ammo_interval, coin_delay
+
+
+def _square_box(x, y, size, scale=1.0):
+    """Integer ``(x, y, size)`` square, truncated like ``pygame.Rect``."""
+    if scale != 1.0:
+        adj = size * scale
+        offset = (size - adj) / 2
+        return int(x + offset), int(y + offset), int(adj)
+    return int(x), int(y), int(size)
+
+
+def _squares_overlap(ax, ay, asize, bx, by, bsize):
+    """``pygame.Rect.colliderect`` for two integer squares."""
+    return (
+        asize > 0
+        and bsize > 0
+        and ax < bx + bsize
+        and bx < ax + asize
+        and ay < by + bsize
+        and by < ay + asize
+    )
+
+
+def check_collision(px, py, ex, ey, size, radius, scale=1.0):
+    """Collision between a circle and square with optional square scaling.
+
+    Both shapes are reduced to integer rectangles the same way ``pygame.Rect``
+    truncates its arguments, so results match the Rect based test exactly.
+    """
+    cx, cy, cs = _square_box(px - radius, py - radius, radius * 2)
+    sx, sy, ss = _square_box(ex, ey, size, scale)
+    return _squares_overlap(cx, cy, cs, sx, sy, ss)
+
+
+def spawn_enemy(state, speed):
+    """Spawn an enemy from a random edge moving inwards."""
+    rng = state.rng
+    width = state.config.width
+    height = state.config.height
+    enemy_size = state.config.enemy_size
+    direction = rng.choice(EDGE_DIRECTIONS)
+    if direction == "down":
+        x = rng.randint(0, width - enemy_size)
+        y = -enemy_size
+        dx, dy = 0, speed
+    elif direction == "up":
+        x = rng.randint(0, width - enemy_size)
+        y = height
+        dx, dy = 0, -speed
+    elif direction == "left":
+        x = width
+        y = rng.randint(0, height - enemy_size)
+        dx, dy = -speed, 0
+    else:  # right
+        x = -enemy_size
+        y = rng.randint(0, height - enemy_size)
+        dx, dy = speed, 0
+    return x, y, dx, dy, direction
+
+
+def spawn_coin(state, speed):
+    """Spawn a coin from a random edge moving across the screen."""
+    rng = state.rng
+    width = state.config.width
+    height = state.config.height
+    coin_size = state.config.coin_size
+    direction = rng.choice(EDGE_DIRECTIONS)
+    if direction == "down":
+        x = rng.randint(0, width - coin_size)
+        y = -coin_size
+        dx, dy = 0, speed
+    elif direction == "up":
+        x = rng.randint(0, width - coin_size)
+        y = height
+        dx, dy = 0, -speed
+    elif direction == "left":
+        x = width
+        y = rng.randint(0, height - coin_size)
+        dx, dy = -speed, 0
+    else:  # right
+        x = -coin_size
+        y = rng.randint(0, height - coin_size)
+        dx, dy = speed, 0
+    return x, y, dx, dy
+
+
+def spawn_ammo(state):
+    """Spawn a stationary ammo pickup inside the screen."""
+    radius = state.config.projectile_radius
+    x = state.rng.randint(radius, state.config.width - radius)
+    y = state.rng.randint(radius, state.config.height - radius)
+    return x, y
+
+
+def respawn_enemy(state, enemy):
+    """Send ``enemy`` back to a random edge with a freshly chosen zombie sheet."""
+    x, y, dx, dy, direction = spawn_enemy(state, state.enemy_speed)
+    enemy.reset(x, y, dx, dy, direction, state.rng.randrange(state.config.zombie_sheets))
+
+
+def _count_enemy_spawn(state):
+    state.enemy_spawn_count += 1
+    if state.enemy_spawn_count % state.ammo_interval == 0 and not state.ammo_pickups:
+        state.ammo_pickups.spawn().reset(*spawn_ammo(state))
+
+
+def use_vectorized(config, enemy_count):
+    """Whether a level with ``enemy_count`` zombies should use NumPy arrays."""
+    if config.backend == "python" or not vectorized.available():
+        return False
+    return config.backend == "numpy" or enemy_count >= VECTORIZE_MIN_ENEMIES
+
+
+def _select_backend(state, enemy_count):
+    state.vectorized = use_vectorized(state.config, enemy_count)
+    if state.vectorized:
+        if state._array_pools is None:
+            state._array_pools = (
+                vectorized.EnemyArrays(EDGE_DIRECTIONS, max(64, enemy_count)),
+                vectorized.ProjectileArrays(),
+            )
+        state.enemies, state.projectiles = state._array_pools
+    else:
+        state.enemies, state.projectiles = state._object_pools
+
+
+def start_level(state, level_num, enemy_speed, coin_speed, enemy_count, ammo_interval, coin_delay):
+    """Reset the per-level part of ``state`` and spawn the opening wave."""
+    cfg = state.config
+    _select_backend(state, enemy_count)
+    state.level_num = level_num
+    state.enemy_speed = enemy_speed
+    state.coin_speed = coin_speed
+    state.ammo_interval = ammo_interval
+    state.coin_delay = coin_delay
+
+    state.player_x = cfg.width // 2
+    state.player_y = cfg.height // 2
+    state.prev_player_x = state.player_x
+    state.prev_player_y = state.player_y
+    state.player_moving = False
+    state.player_anim_index = 0
+    state.player_anim_timer = 0
+
+    state.enemies.clear()
+    for _ in range(enemy_count):
+        respawn_enemy(state, state.enemies.spawn())
+    state.enemy_spawn_count = enemy_count
+
+    state.coins.clear()
+    state.coins.spawn().reset(*spawn_coin(state, coin_speed))
+    state.coin_respawn_timer = 0
+
+    state.ammo_pickups.clear()
+    state.projectiles.clear()
+    state.ammo = START_AMMO
+
+    state.elapsed = 0
+    state.events.clear()
+    state.result = None
+
+
+def _update_player(state, inputs, frames):
+    cfg = state.config
+    state.prev_player_x = state.player_x
+    state.prev_player_y = state.player_y
+    speed = cfg.player_speed * frames
+    moving = False
+    if inputs.left:
+        state.player_x -= speed
+        moving = True
+    if inputs.right:
+        state.player_x += speed
+        moving = True
+    if inputs.up:
+        state.player_y -= speed
+        moving = True
+    if inputs.down:
+        state.player_y += speed
+        moving = True
+
+    if moving:
+        state.player_anim_timer += frames
+        if state.player_anim_timer >= PLAYER_ANIM_FRAMES:
+            state.player_anim_timer = 0
+            state.player_anim_index = (state.player_anim_index + 1) % cfg.player_walk_frames
+    else:
+        state.player_anim_timer = 0
+    state.player_moving = moving
+
+    radius = cfg.player_radius
+    state.player_x = max(radius, min(cfg.width - radius, state.player_x))
+    state.player_y = max(radius, min(cfg.height - radius, state.player_y))
+
+
+def _update_enemies(state, dt, frames):
+    cfg = state.config
+    if state.vectorized:
+        off = state.enemies.advance(
+            dt, ZOMBIE_FRAME_TIME, cfg.zombie_frames, cfg.enemy_size, cfg.width, cfg.height, frames
+        )
+        for index in off:
+            respawn_enemy(state, state.enemies[index])
+            _count_enemy_spawn(state)
+        return
+    enemy_size = cfg.enemy_size
+    width = cfg.width
+    height = cfg.height
+    for enemy in state.enemies:
+        enemy.anim_timer += dt
+        if enemy.anim_timer >= ZOMBIE_FRAME_TIME:
+            enemy.anim_timer = 0
+            enemy.frame = (enemy.frame + 1) % cfg.zombie_frames
+        enemy.x += enemy.dx * frames
+        enemy.y += enemy.dy * frames
+        if (
+            enemy.x < -enemy_size
+            or enemy.x > width
+            or enemy.y < -enemy_size
+            or enemy.y > height
+        ):
+            respawn_enemy(state, enemy)
+            _count_enemy_spawn(state)
+
+
+def _update_coins(state, dt, frames):
+    cfg = state.config
+    coins = state.coins
+    coin_size = cfg.coin_size
+    if coins:
+        i = 0
+        while i < len(coins):
+            coin = coins[i]
+            coin.x += coin.dx * frames
+            coin.y += coin.dy * frames
+            coin.anim_timer += dt
+            if coin.anim_timer >= COIN_FRAME_TIME:
+                coin.anim_timer = 0
+                if coin.dx > 0 or coin.dy < 0:
+                    coin.anim_index = (coin.anim_index + 1) % cfg.coin_frames
+                else:
+                    coin.anim_index = (coin.anim_index - 1) % cfg.coin_frames
+            if (
+                coin.x < -coin_size
+                or coin.x > cfg.width
+                or coin.y < -coin_size
+                or coin.y > cfg.height
+            ):
+                coins.despawn(i)
+                state.coin_respawn_timer = state.coin_delay
+                continue
+            i += 1
+    else:
+        state.coin_respawn_timer -= dt
+        if state.coin_respawn_timer <= 0:
+            coins.spawn().reset(*spawn_coin(state, state.coin_speed))
+
+
+def _update_projectiles(state, frames):
+    cfg = state.config
+    if state.vectorized:
+        state.projectiles.advance(cfg.projectile_radius, cfg.width, cfg.height, frames, SHURIKEN_SPIN)
+        return
+    projectiles = state.projectiles
+    radius = cfg.projectile_radius
+    i = 0
+    while i < len(projectiles):
+        p = projectiles[i]
+        p.x += p.dx * frames
+        p.y += p.dy * frames
+        p.angle = (p.angle + SHURIKEN_SPIN * frames) % 360
+        if (
+            p.x < -radius
+            or p.x > cfg.width + radius
+            or p.y < -radius
+            or p.y > cfg.height + radius
+        ):
+            projectiles.despawn(i)
+            continue
+        i += 1
+
+
+def _set_box(boxes, index, box):
+    if index < len(boxes):
+        boxes[index] = box
+    else:
+        boxes.append(box)
+
+
+def _build_grids(state):
+    """Rebuild the enemy and coin broad-phase grids from current positions.
+
+    The enemy grid is skipped for the NumPy backend, which tests zombies
+    with batched array operations instead.
+    """
+    cfg = state.config
+    if not state.vectorized:
+        grid = state.enemy_grid
+        boxes = state.enemy_boxes
+        grid.clear()
+        for i, enemy in enumerate(state.enemies):
+            box = _square_box(enemy.x, enemy.y, cfg.enemy_size, cfg.hitbox_scale)
+            _set_box(boxes, i, box)
+            grid.insert(i, box[0], box[1], box[2], box[2])
+
+    grid = state.coin_grid
+    boxes = state.coin_boxes
+    grid.clear()
+    for i, coin in enumerate(state.coins):
+        box = _square_box(coin.x, coin.y, cfg.coin_size)
+        _set_box(boxes, i, box)
+        grid.insert(i, box[0], box[1], box[2], box[2])
+
+
+def _refresh_enemy(state, index):
+    """Move a just respawned enemy to its new cells in the grid."""
+    cfg = state.config
+    enemy = state.enemies[index]
+    box = _square_box(enemy.x, enemy.y, cfg.enemy_size, cfg.hitbox_scale)
+    state.enemy_boxes[index] = box
+    state.enemy_grid.move(index, box[0], box[1], box[2], box[2])
+
+
+def _despawn_coin(state, index):
+    """Despawn a coin and re-key the coin that swap-remove moved into its slot."""
+    coins = state.coins
+    grid = state.coin_grid
+    last = len(coins) - 1
+    grid.remove(index)
+    coins.despawn(index)
+    if index != last:
+        grid.remove(last)
+        box = state.coin_boxes[last]
+        state.coin_boxes[index] = box
+        grid.insert(index, box[0], box[1], box[2], box[2])
+    state.coin_respawn_timer = state.coin_delay
+
+
+def _first_hit(grid, boxes, x, y, size, candidates):
+    """Lowest pool index whose box overlaps the square, or ``None``.
+
+    Picking the lowest index reproduces the result of testing every entity
+    in pool order and stopping at the first hit.
+    """
+    grid.query(x, y, size, size, candidates)
+    if not candidates:
+        return None
+    if len(candidates) == 1:
+        order = candidates
+    else:
+        order = sorted(candidates)
+    for index in order:
+        bx, by, bsize = boxes[index]
+        if _squares_overlap(x, y, size, bx, by, bsize):
+            return index
+    return None
+
+
+def _check_projectiles_vectorized(state):
+    """Array version of ``_check_projectiles`` with identical results.
+
+    One batched overlap test finds which shuriken touch which zombies and
+    coins. Only when something was hit are the shuriken walked in the same
+    order as the Python loop, so that swap-removes, the lowest-index rule
+    and zombies respawning into the path of later shuriken all play out
+    exactly as they would there.
+    """
+    cfg = state.config
+    projectiles = state.projectiles
+    enemies = state.enemies
+    count = len(projectiles)
+    if not count:
+        return
+    radius = cfg.projectile_radius
+    span = int(radius * 2)
+    px, py = projectiles.boxes(radius)
+    ex, ey, eside = enemies.hitboxes(cfg.enemy_size, cfg.hitbox_scale)
+    enemy_hits = vectorized.overlap_matrix(px, py, span, ex, ey, eside)
+    enemy_any = enemy_hits.any(axis=1)
+    coin_any = None
+    if state.coins:
+        cx = vectorized.np.array([box[0] for box in state.coin_boxes[: len(state.coins)]])
+        cy = vectorized.np.array([box[1] for box in state.coin_boxes[: len(state.coins)]])
+        coin_any = vectorized.overlap_matrix(px, py, span, cx, cy, int(cfg.coin_size)).any(axis=1)
+        if not (enemy_any.any() or coin_any.any()):
+            return
+    elif not enemy_any.any():
+        return
+
+    px = px.tolist()
+    py = py.tolist()
+    enemy_any = enemy_any.tolist()
+    coin_any = coin_any.tolist() if coin_any is not None else None
+    candidates = state._candidates
+    # order[i] is the original row of the shuriken now at position i
+    order = list(range(count))
+    moved = {}
+    i = 0
+    while i < len(projectiles):
+        row = order[i]
+        x = px[row]
+        y = py[row]
+        hit = None
+        if enemy_any[row]:
+            for index in vectorized.np.flatnonzero(enemy_hits[row]).tolist():
+                if index not in moved:
+                    hit = index
+                    break
+        for index, (bx, by, bsize) in moved.items():
+            if (hit is None or index < hit) and _squares_overlap(x, y, span, bx, by, bsize):
+                hit = index
+        if hit is not None:
+            state.score += 1
+            state.events.append("hit")
+            respawn_enemy(state, enemies[hit])
+            moved[hit] = _square_box(enemies.x[hit], enemies.y[hit], cfg.enemy_size, cfg.hitbox_scale)
+            _count_enemy_spawn(state)
+            projectiles.despawn(i)
+            order[i] = order[len(projectiles)]
+            continue
+        if coin_any is not None and coin_any[row]:
+            hit = _first_hit(state.coin_grid, state.coin_boxes, x, y, span, candidates)
+            if hit is not None:
+                state.score += 5
+                state.events.append("coin")
+                _despawn_coin(state, hit)
+                projectiles.despawn(i)
+                order[i] = order[len(projectiles)]
+                continue
+        i += 1
+
+
+def _check_projectiles(state):
+    cfg = state.config
+    if state.vectorized:
+        _check_projectiles_vectorized(state)
+        return
+    projectiles = state.projectiles
+    enemies = state.enemies
+    radius = cfg.projectile_radius
+    span = int(radius * 2)
+    candidates = state._candidates
+    i = 0
+    while i < len(projectiles):
+        p = projectiles[i]
+        px = int(p.x - radius)
+        py = int(p.y - radius)
+        hit = _first_hit(state.enemy_grid, state.enemy_boxes, px, py, span, candidates)
+        if hit is not None:
+            state.score += 1
+            state.events.append("hit")
+            respawn_enemy(state, enemies[hit])
+            _refresh_enemy(state, hit)
+            _count_enemy_spawn(state)
+            projectiles.despawn(i)
+            continue
+        hit = _first_hit(state.coin_grid, state.coin_boxes, px, py, span, candidates)
+        if hit is not None:
+            state.score += 5
+            state.events.append("coin")
+            _despawn_coin(state, hit)
+            projectiles.despawn(i)
+            continue
+        i += 1
+
+
+def _check_player(state):
+    """Resolve player pickups; return ``True`` if a zombie caught the player."""
+    cfg = state.config
+    px, py, span = _square_box(
+        state.player_x - cfg.player_radius,
+        state.player_y - cfg.player_radius,
+        cfg.player_radius * 2,
+    )
+    candidates = state._candidates
+    if state.vectorized:
+        ex, ey, eside = state.enemies.hitboxes(cfg.enemy_size, cfg.hitbox_scale)
+        caught = vectorized.any_overlap(px, py, span, ex, ey, eside)
+    else:
+        caught = _first_hit(state.enemy_grid, state.enemy_boxes, px, py, span, candidates) is not None
+    if caught:
+        state.events.append("hit")
+        return True
+
+    state.coin_grid.query(px, py, span, span, candidates)
+    # Highest index first: swap-remove only moves already visited coins
+    for index in sorted(candidates, reverse=True):
+        bx, by, bsize = state.coin_boxes[index]
+        if _squares_overlap(px, py, span, bx, by, bsize):
+            state.score += 1
+            state.events.append("coin")
+            _despawn_coin(state, index)
+
+    pickups = state.ammo_pickups
+    radius = cfg.projectile_radius
+    i = 0
+    while i < len(pickups):
+        pickup = pickups[i]
+        if check_collision(
+            state.player_x, state.player_y,
+            pickup.x - radius, pickup.y - radius,
+            radius * 2, cfg.player_radius
+        ):
+            state.ammo += 1
+            pickups.despawn(i)
+            continue
+        i += 1
+    return False
+
+
+def update(state, inputs, dt, mark=None):
+    """Apply ``inputs`` and move every entity forward by ``dt`` seconds.
+
+    This is the first half of ``step``; ``collide`` must run afterwards to
+    resolve hits. Returns ``"complete"`` once the level timer runs out.
+    ``mark``, if given, is called with ``"player"``, ``"enemies"`` and
+    ``"coins/projectiles"`` after each section, e.g. to time them.
+    """
+    state.events.clear()
+    if state.result is not None:
+        return state.result
+
+    state.elapsed += dt
+    if state.elapsed >= state.config.level_duration:
+        state.result = "complete"
+        return state.result
+
+    speed = state.config.projectile_speed
+    for direction in inputs.throws:
+        if state.ammo <= 0:
+            break
+        vx, vy = THROW_VECTORS[direction]
+        state.projectiles.spawn().reset(state.player_x, state.player_y, vx * speed, vy * speed)
+        state.ammo -= 1
+        state.events.append("swish")
+
+    # Per-frame speeds are scaled to the length of this tick
+    frames = dt * FRAME_RATE
+    _update_player(state, inputs, frames)
+    if mark:
+        mark("player")
+    _update_enemies(state, dt, frames)
+    if mark:
+        mark("enemies")
+    _update_coins(state, dt, frames)
+    _update_projectiles(state, frames)
+    if mark:
+        mark("coins/projectiles")
+    return None
+
+
+def collide(state):
+    """Resolve shuriken hits and player contacts after ``update``.
+
+    Returns ``"dead"`` if a zombie reached the player, otherwise ``None``.
+    """
+    _build_grids(state)
+    _check_projectiles(state)
+    if _check_player(state):
+        state.result = "dead"
+        return state.result
+
+    while state.score >= state.next_life_score:
+        state.lives += 1
+        state.next_life_score += 10
+    return None
+
+
+def step(state, inputs, dt, mark=None):
+    """Advance ``state`` by one tick of ``dt`` seconds.
+
+    Returns ``state.result``: ``None`` while the level is still running,
+    otherwise ``"complete"`` or ``"dead"``. ``mark`` is passed to ``update``
+    and additionally called with ``"collision"`` after ``collide``.
+    """
+    result = update(state, inputs, dt, mark)
+    if result is not None:
+        return result
+    result = collide(state)
+    if mark:
+        mark("collision")
+    return result
+
+
+def finish_level(state, result):
+    """Apply the session rules after a level ended with ``result``.
+
+    A completed level moves on to the next one and a death costs a life and
+    restarts the level. Returns the level number to play next, or ``None``
+    once the last life is gone.
+    """
+    if result == "complete":
+        return state.level_num + 1
+    state.lives -= 1
+    if state.lives > 0:
+        return state.level_num
+    return None
@@ -0,0 +1,70 @@
+"""On-disk cache of decoded sound effects.
+
+Decoding a WAV/OGG/MP3 file costs far more than copying its samples, so
+``SoundCache`` decodes each file once, writes the raw PCM (already in the
+mixer's sample format) next to the other cached files and, on later runs,
+builds the ``pygame.mixer.Sound`` straight from a memory-mapped copy of it.
+
+Entries are keyed by the file's absolute path, mtime and size plus the
+mixer's ``(frequency, format, channels)``, so editing a sound or changing
+the mixer settings simply misses the cache. Any failure to read or write
+the cache falls back to decoding the file as usual.
+"""
+
+import hashlib
+import mmap
+import os
+
+import pygame
+
+
+def default_cache_dir():
+    """Per-user cache directory for decoded sounds."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "creepy-tomatoe", "sounds")
+
+
+class SoundCache:
+    """Load sounds through a cache of decoded PCM in ``cache_dir``."""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, path):
+        st = os.stat(path)
+        key = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{pygame.mixer.get_init()}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".pcm")
+
+    def load(self, path):
+        """Return a ``Sound`` for ``path``; raises like ``Sound(path)``."""
+        entry = self._entry(path)
+        try:
+            with open(entry, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                sound = pygame.mixer.Sound(buffer=data)
+            self.hits += 1
+            return sound
+        except (OSError, ValueError):
+            # Missing or empty entry; decode below
+            pass
+
+        sound = pygame.mixer.Sound(path)
+        self.misses += 1
+        self._store(entry, sound.get_raw())
+        return sound
+
+    def _store(self, entry, raw):
+        # Write to a temporary name first so a concurrent reader never maps
+        # a half-written entry
+        tmp = f"{entry}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp, "wb") as fh:
+                fh.write(raw)
+            os.replace(tmp, entry)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
@@ -0,0 +1,91 @@
+"""Uniform-grid spatial hash used as the collision broad phase.
+
+Entities are registered under a caller chosen key together with an integer
+axis aligned box. ``query`` returns the keys whose boxes share at least one
+grid cell with the query box, so the expensive narrow phase only runs on
+nearby pairs instead of every combination.
+"""
+
+# Cell coordinates are packed into one int; play areas stay far below this
+_ROW_STRIDE = 1 << 16
+
+
+class SpatialHash:
+    """Grid of ``cell_size`` square buckets mapping cells to entity keys.
+
+    Boxes are half-open ``[x, x + w) x [y, y + h)`` like ``pygame.Rect`` so
+    two boxes that overlap always have a cell in common. Bucket lists are
+    kept between frames and only emptied by ``clear`` to avoid reallocating
+    them on every rebuild.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = max(1, int(cell_size))
+        self.cells = {}
+        self.entries = {}
+
+    def clear(self):
+        """Remove every entry while keeping the bucket lists for reuse."""
+        for bucket in self.cells.values():
+            bucket.clear()
+        self.entries.clear()
+
+    def _cells(self, x, y, w, h):
+        cs = self.cell_size
+        x0 = x // cs
+        y0 = y // cs
+        x1 = (x + max(w, 1) - 1) // cs
+        y1 = (y + max(h, 1) - 1) // cs
+        if x0 == x1 and y0 == y1:
+            return (x0 * _ROW_STRIDE + y0,)
+        return tuple(
+            cx * _ROW_STRIDE + cy
+            for cx in range(x0, x1 + 1)
+            for cy in range(y0, y1 + 1)
+        )
+
+    def insert(self, key, x, y, w, h):
+        """Register ``key`` as occupying the box ``(x, y, w, h)``."""
+        cells = self._cells(x, y, w, h)
+        buckets = self.cells
+        for cell in cells:
+            bucket = buckets.get(cell)
+            if bucket is None:
+                bucket = buckets[cell] = []
+            bucket.append(key)
+        self.entries[key] = cells
+
+    def remove(self, key):
+        """Forget ``key``; unknown keys are ignored."""
+        cells = self.entries.pop(key, None)
+        if cells is None:
+            return
+        buckets = self.cells
+        for cell in cells:
+            buckets[cell].remove(key)
+
+    def move(self, key, x, y, w, h):
+        """Update the box of an already registered ``key``."""
+        cells = self._cells(x, y, w, h)
+        if self.entries.get(key) == cells:
+            return
+        self.remove(key)
+        self.insert(key, x, y, w, h)
+
+    def query(self, x, y, w, h, out=None):
+        """Collect the keys sharing a cell with ``(x, y, w, h)``.
+
+        Results are added to ``out`` (a set, cleared first) when given so
+        callers can reuse one set every frame; otherwise a new set is
+        returned.
+        """
+        if out is None:
+            out = set()
+        else:
+            out.clear()
+        buckets = self.cells
+        for cell in self._cells(x, y, w, h):
+            bucket = buckets.get(cell)
+            if bucket:
+                out.update(bucket)
+        return out
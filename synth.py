@@ -0,0 +1,156 @@
+"""Procedural sound effects rendered with NumPy.
+
+Sounds are built from a few batched array operations instead of one Python
+call per sample:
+
+* ``oscillator`` renders a sine, square or noise signal, optionally sweeping
+  its pitch from ``freq`` to ``freq_end``;
+* ``adsr`` builds an attack/decay/sustain/release envelope to multiply in;
+* ``mix`` sums signals with per-signal gains, padding the shorter ones;
+* ``to_sound`` converts a ``[-1, 1]`` float signal to the mixer's sample
+  format and channel count and hands it to ``pygame.mixer.Sound(buffer=...)``
+  without a WAV file in between;
+* ``repitch`` resamples an existing ``Sound`` so one sample can be played
+  at several pitches.
+
+``PRESETS`` holds stand-ins for the game's hit, coin and swish effects,
+used when their sound files are missing. Callers check ``available()``
+first; it is ``vectorized.available``, since both need NumPy.
+"""
+
+import pygame
+
+import vectorized
+
+np = vectorized.np
+available = vectorized.available
+
+DEFAULT_SAMPLE_RATE = 44100
+
+
+def sample_rate():
+    """The mixer's sample rate, or ``DEFAULT_SAMPLE_RATE`` without a mixer."""
+    init = pygame.mixer.get_init()
+    return init[0] if init else DEFAULT_SAMPLE_RATE
+
+
+def oscillator(wave, freq, duration, freq_end=None, rate=None, rng=None):
+    """Render ``duration`` seconds of ``"sine"``, ``"square"`` or ``"noise"``.
+
+    With ``freq_end`` the pitch sweeps exponentially from ``freq`` to
+    ``freq_end`` over the duration. Noise ignores the pitch.
+    """
+    rate = rate or sample_rate()
+    n = int(duration * rate)
+    if wave == "noise":
+        rng = rng or np.random.default_rng()
+        return rng.uniform(-1.0, 1.0, n)
+    if freq_end is None or freq_end == freq:
+        phase = np.arange(n) * (2 * np.pi * freq / rate)
+    else:
+        freqs = freq * (freq_end / freq) ** np.linspace(0.0, 1.0, n, endpoint=False)
+        phase = np.cumsum(freqs) * (2 * np.pi / rate)
+    signal = np.sin(phase)
+    if wave == "square":
+        signal = np.where(signal >= 0.0, 1.0, -1.0)
+    elif wave != "sine":
+        raise ValueError(f"unknown wave {wave!r}")
+    return signal
+
+
+def adsr(n, attack=0.01, decay=0.05, sustain=0.7, release=0.1, rate=None):
+    """Envelope of ``n`` samples; times in seconds, ``sustain`` a level.
+
+    The release always ends the envelope, so sustain fills whatever is left
+    after attack, decay and release. Segments are shortened proportionally
+    when they do not fit.
+    """
+    rate = rate or sample_rate()
+    lengths = np.array([attack, decay, release], dtype=float) * rate
+    total = lengths.sum()
+    if total > n:
+        lengths *= n / total
+    a, d, r = (int(x) for x in lengths)
+    s = n - a - d - r
+    return np.concatenate((
+        np.linspace(0.0, 1.0, a, endpoint=False),
+        np.linspace(1.0, sustain, d, endpoint=False),
+        np.full(s, sustain),
+        np.linspace(sustain, 0.0, r),
+    ))
+
+
+def mix(*signals, gains=None):
+    """Sum ``signals`` (scaled by ``gains``), padding to the longest one.
+
+    The result is scaled down if it would clip.
+    """
+    gains = gains or (1.0,) * len(signals)
+    out = np.zeros(max(len(s) for s in signals))
+    for signal, gain in zip(signals, gains):
+        out[:len(signal)] += signal * gain
+    peak = np.abs(out).max(initial=0.0)
+    if peak > 1.0:
+        out /= peak
+    return out
+
+
+def to_sound(signal, volume=1.0):
+    """Convert a ``[-1, 1]`` float signal to a ``pygame.mixer.Sound``."""
+    _, fmt, channels = pygame.mixer.get_init()
+    signal = np.clip(signal * volume, -1.0, 1.0)
+    bits = abs(fmt)
+    if bits == 32:
+        samples = signal.astype(np.float32)
+    else:
+        peak = (1 << (bits - 1)) - 1
+        samples = np.round(signal * peak)
+        if fmt > 0:
+            samples += peak + 1
+        samples = samples.astype(f"{'i' if fmt < 0 else 'u'}{bits // 8}")
+    if channels > 1:
+        samples = np.repeat(samples, channels)
+    return pygame.mixer.Sound(buffer=samples.tobytes())
+
+
+def repitch(sound, factor):
+    """Return a copy of ``sound`` resampled to play ``factor`` times higher."""
+    _, fmt, channels = pygame.mixer.get_init()
+    bits = abs(fmt)
+    dtype = np.float32 if bits == 32 else f"{'i' if fmt < 0 else 'u'}{bits // 8}"
+    frames = np.frombuffer(sound.get_raw(), dtype=dtype).reshape(-1, channels)
+    positions = np.arange(0.0, len(frames) - 1, factor)
+    index = np.arange(len(frames))
+    out = np.empty((len(positions), channels))
+    for c in range(channels):
+        out[:, c] = np.interp(positions, index, frames[:, c])
+    if bits != 32:
+        out = np.round(out)
+    return pygame.mixer.Sound(buffer=out.astype(dtype).tobytes())
+
+
+def hit(pitch=1.0):
+    """Short thud: a falling square blip over a burst of noise."""
+    body = oscillator("square", 180 * pitch, 0.18, freq_end=60 * pitch)
+    noise = oscillator("noise", 0, 0.08)
+    signal = mix(body, noise, gains=(0.6, 0.5))
+    return signal * adsr(len(signal), attack=0.002, decay=0.05, sustain=0.4, release=0.1)
+
+
+def coin(pitch=1.0):
+    """Two rising sine notes."""
+    first = oscillator("sine", 988 * pitch, 0.07)
+    second = oscillator("sine", 1319 * pitch, 0.18)
+    signal = np.concatenate((first, second))
+    return signal * adsr(len(signal), attack=0.003, decay=0.04, sustain=0.6, release=0.12)
+
+
+def swish(pitch=1.0):
+    """Noise under a quick downward sine sweep."""
+    noise = oscillator("noise", 0, 0.15)
+    sweep = oscillator("sine", 1400 * pitch, 0.15, freq_end=400 * pitch)
+    signal = mix(noise, sweep, gains=(0.5, 0.2))
+    return signal * adsr(len(signal), attack=0.03, decay=0.05, sustain=0.5, release=0.07)
+
+
+PRESETS = {"hit": hit, "coin": coin, "swish": swish}
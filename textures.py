@@ -0,0 +1,111 @@
+"""GPU textures for the ``--renderer texture`` level renderer.
+
+Drawing a ``pygame._sdl2`` texture is a copy done by the GPU, or by SDL's
+software renderer without one, instead of a ``Surface.blit`` per sprite.
+``TextureCache`` uploads surfaces once and ``TextureQueue`` draws queued
+sprites like ``game.RenderQueue``. Older pygame builds without
+``pygame._sdl2`` make ``display_renderer`` return ``None``.
+"""
+
+import pygame
+
+try:
+    from pygame._sdl2.video import Renderer, Texture, Window
+except ImportError:
+    Renderer = Texture = Window = None
+
+# Textures kept for surfaces that were not uploaded up front
+TRANSIENT_TEXTURES = 256
+
+
+def display_renderer():
+    """Return the ``Renderer`` pygame drives for the display, or ``None``.
+
+    Only ``pygame.SCALED`` windows have one, which also keeps
+    ``pygame.display.flip`` working for the menus. Set the
+    ``SDL_RENDER_DRIVER`` environment variable (e.g. to ``software``) to
+    choose SDL's driver.
+    """
+    if Renderer is None:
+        return None
+    try:
+        return Renderer.from_window(Window.from_display_module())
+    except (pygame.error, AttributeError):
+        return None
+
+
+class TextureCache:
+    """Textures for surfaces, uploaded on first use.
+
+    Surfaces passed to ``upload`` stay resident. Any other surface keeps its
+    texture while it is among the ``transient`` most recently drawn ones;
+    surfaces must not be modified once drawn.
+    """
+
+    def __init__(self, renderer, transient=TRANSIENT_TEXTURES):
+        self.renderer = renderer
+        self.max_transient = transient
+        self.resident = {}
+        self.transient = {}
+
+    def upload(self, surfaces):
+        """Upload ``surfaces`` once and keep their textures."""
+        for surface in surfaces:
+            if surface not in self.resident:
+                self.resident[surface] = Texture.from_surface(self.renderer, surface)
+
+    def get(self, surface):
+        """Return the texture for ``surface``, uploading it if needed."""
+        texture = self.resident.get(surface)
+        if texture is not None:
+            return texture
+        # Re-inserting keeps ``transient`` ordered from least recently used
+        texture = self.transient.pop(surface, None)
+        if texture is None:
+            texture = Texture.from_surface(self.renderer, surface)
+            if len(self.transient) >= self.max_transient:
+                del self.transient[next(iter(self.transient))]
+        self.transient[surface] = texture
+        return texture
+
+
+class TextureQueue:
+    """Sprites queued by layer and drawn as texture copies.
+
+    Has the same ``origin_x``, ``add`` and ``add_rotated`` interface as
+    ``game.RenderQueue``; ``flush`` draws onto the cache's renderer.
+    """
+
+    def __init__(self, textures, layers):
+        self.textures = textures
+        self.origin_x = 0
+        self.order = tuple(layers)
+        self.layers = {name: [] for name in self.order}
+
+    def add(self, layer, sprites):
+        """Queue ``(surface, x, y)`` triples on ``layer``."""
+        ox = self.origin_x
+        self.layers[layer].extend([(surface, x + ox, y, 0) for surface, x, y in sprites])
+
+    def add_rotated(self, layer, image, sprites):
+        """Queue ``image`` centred on each ``(x, y, angle)``.
+
+        ``angle`` is in degrees counter-clockwise, as for
+        ``pygame.transform.rotate``; SDL rotates clockwise.
+        """
+        ox = self.origin_x - image.get_width() / 2
+        oy = image.get_height() / 2
+        self.layers[layer].extend([(image, x + ox, y - oy, -angle) for x, y, angle in sprites])
+
+    def flush(self):
+        """Draw and empty every layer in order."""
+        get = self.textures.get
+        for name in self.order:
+            batch = self.layers[name]
+            for surface, x, y, angle in batch:
+                texture = get(surface)
+                if angle:
+                    texture.draw(dstrect=(x, y, texture.width, texture.height), angle=angle)
+                else:
+                    texture.draw(dstrect=(x, y))
+            batch.clear()
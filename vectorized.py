@@ -0,0 +1,299 @@
+"""Optional NumPy struct-of-arrays storage for large entity counts.
+
+``EnemyArrays`` and ``ProjectileArrays`` keep positions, velocities,
+directions and animation timers in contiguous arrays so ``simulation`` can
+advance every entity, find off-screen ones and test projectile/enemy overlaps
+with a handful of batched operations per frame. They mimic the parts of
+``entities.EntityPool`` the simulation and renderer use: ``spawn`` and
+indexing return lightweight row references with a ``reset`` method, while
+iteration yields read-only ``Enemy``/``Projectile`` snapshots for drawing.
+
+NumPy is optional; ``available()`` reports whether this backend can be used
+and the simulation falls back to its pure-Python path otherwise.
+"""
+
+from entities import Enemy, Projectile
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def available():
+    """Return ``True`` when NumPy is installed."""
+    return np is not None
+
+
+class _RowRef:
+    """Reference to one row of an ``ArrayPool`` used to reinitialise it."""
+
+    __slots__ = ("pool", "index")
+
+    def __init__(self, pool, index):
+        self.pool = pool
+        self.index = index
+
+    def reset(self, *args):
+        self.pool.reset_row(self.index, *args)
+
+
+class ArrayPool:
+    """Growable struct-of-arrays with O(1) swap-remove.
+
+    Subclasses list their columns in ``fields`` as ``(name, dtype)`` pairs,
+    implement ``reset_row`` and ``_fill`` (copying rows into snapshot
+    objects) and name the ``entity_class`` used for snapshots.
+    """
+
+    fields = ()
+    entity_class = None
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.capacity = capacity
+        for name, dtype in self.fields:
+            setattr(self, name, np.zeros(capacity, dtype))
+        self._snapshots = []
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.snapshot())
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return _RowRef(self, index)
+
+    def _grow(self):
+        capacity = self.capacity * 2
+        for name, dtype in self.fields:
+            column = np.zeros(capacity, dtype)
+            column[: self.count] = getattr(self, name)[: self.count]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def spawn(self):
+        """Append a row and return a reference for ``reset``."""
+        if self.count == self.capacity:
+            self._grow()
+        self.count += 1
+        return _RowRef(self, self.count - 1)
+
+    def despawn(self, index):
+        """Swap-remove the row at ``index``."""
+        last = self.count - 1
+        if index != last:
+            for name, _ in self.fields:
+                column = getattr(self, name)
+                column[index] = column[last]
+        self.count = last
+
+    def compact(self, removed):
+        """Despawn every row flagged in the boolean array ``removed``.
+
+        Rows end up in the same order a forward scan calling ``despawn`` on
+        each flagged row would leave them: holes in the surviving prefix are
+        filled, lowest first, by the surviving tail rows taken from the end.
+        """
+        n = self.count
+        keep = n - int(removed.sum())
+        holes = np.flatnonzero(removed[:keep])
+        if len(holes):
+            movers = (np.flatnonzero(~removed[keep:n]) + keep)[::-1]
+            for name, _ in self.fields:
+                column = getattr(self, name)
+                column[holes] = column[movers]
+        self.count = keep
+
+    def clear(self):
+        self.count = 0
+
+    def snapshot(self):
+        """Return entity objects mirroring the live rows.
+
+        The objects are reused between calls and changing them does not
+        write back to the arrays.
+        """
+        n = self.count
+        objs = self._snapshots
+        while len(objs) < n:
+            objs.append(self.entity_class())
+        self._fill(objs, n)
+        return objs[:n]
+
+
+class EnemyArrays(ArrayPool):
+    """Zombie columns; ``direction`` is an index into ``directions``."""
+
+    fields = (
+        ("x", "f8"),
+        ("y", "f8"),
+        ("dx", "f8"),
+        ("dy", "f8"),
+        ("direction", "i1"),
+        ("sheet", "i2"),
+        ("frame", "i2"),
+        ("anim_timer", "f8"),
+    )
+    entity_class = Enemy
+
+    def __init__(self, directions, capacity=64):
+        super().__init__(capacity)
+        self.directions = list(directions)
+        self.direction_codes = {name: i for i, name in enumerate(self.directions)}
+
+    def reset_row(self, index, x, y, dx, dy, direction, sheet):
+        self.x[index] = x
+        self.y[index] = y
+        self.dx[index] = dx
+        self.dy[index] = dy
+        self.direction[index] = self.direction_codes[direction]
+        self.sheet[index] = sheet
+        self.frame[index] = 0
+        self.anim_timer[index] = 0
+
+    def _fill(self, objs, n):
+        names = self.directions
+        rows = zip(
+            objs,
+            self.x[:n].tolist(),
+            self.y[:n].tolist(),
+            self.dx[:n].tolist(),
+            self.dy[:n].tolist(),
+            self.direction[:n].tolist(),
+            self.sheet[:n].tolist(),
+            self.frame[:n].tolist(),
+            self.anim_timer[:n].tolist(),
+        )
+        for obj, x, y, dx, dy, direction, sheet, frame, timer in rows:
+            obj.x = x
+            obj.y = y
+            obj.dx = dx
+            obj.dy = dy
+            obj.direction = names[direction]
+            obj.sheet = sheet
+            obj.frame = frame
+            obj.anim_timer = timer
+
+    def advance(self, dt, frame_time, frames, size, width, height, scale=1.0):
+        """Animate and move every zombie; return indices now off-screen.
+
+        Velocities are multiplied by ``scale``, the tick length in frames.
+        """
+        n = self.count
+        if not n:
+            return []
+        timer = self.anim_timer[:n]
+        timer += dt
+        tick = timer >= frame_time
+        if tick.any():
+            timer[tick] = 0
+            frame = self.frame[:n]
+            frame[tick] = (frame[tick] + 1) % frames
+        x = self.x[:n]
+        y = self.y[:n]
+        x += self.dx[:n] * scale
+        y += self.dy[:n] * scale
+        off = (x < -size) | (x > width) | (y < -size) | (y > height)
+        return np.flatnonzero(off).tolist()
+
+    def hitboxes(self, size, scale):
+        """Integer hitbox ``(x, y)`` arrays and side, truncated like ``int``."""
+        n = self.count
+        if scale != 1.0:
+            adj = size * scale
+            offset = (size - adj) / 2
+            side = int(adj)
+        else:
+            offset = 0
+            side = int(size)
+        return (
+            (self.x[:n] + offset).astype(np.int64),
+            (self.y[:n] + offset).astype(np.int64),
+            side,
+        )
+
+
+class ProjectileArrays(ArrayPool):
+    """Shuriken columns."""
+
+    fields = (
+        ("x", "f8"),
+        ("y", "f8"),
+        ("dx", "f8"),
+        ("dy", "f8"),
+        ("angle", "f8"),
+    )
+    entity_class = Projectile
+
+    def reset_row(self, index, x, y, dx, dy, angle=0):
+        self.x[index] = x
+        self.y[index] = y
+        self.dx[index] = dx
+        self.dy[index] = dy
+        self.angle[index] = angle
+
+    def _fill(self, objs, n):
+        rows = zip(
+            objs,
+            self.x[:n].tolist(),
+            self.y[:n].tolist(),
+            self.dx[:n].tolist(),
+            self.dy[:n].tolist(),
+            self.angle[:n].tolist(),
+        )
+        for obj, x, y, dx, dy, angle in rows:
+            obj.x = x
+            obj.y = y
+            obj.dx = dx
+            obj.dy = dy
+            obj.angle = angle
+
+    def advance(self, radius, width, height, scale=1.0, spin=15):
+        """Move and spin every shuriken and drop the ones off-screen.
+
+        Velocities and the ``spin`` in degrees are per frame and multiplied
+        by ``scale``, the tick length in frames.
+        """
+        n = self.count
+        if not n:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        x += self.dx[:n] * scale
+        y += self.dy[:n] * scale
+        angle = self.angle[:n]
+        angle += spin * scale
+        angle %= 360
+        off = (x < -radius) | (x > width + radius) | (y < -radius) | (y > height + radius)
+        if off.any():
+            self.compact(off)
+
+    def boxes(self, radius):
+        """Integer top-left corners of each shuriken's collision square."""
+        n = self.count
+        return (
+            (self.x[:n] - radius).astype(np.int64),
+            (self.y[:n] - radius).astype(np.int64),
+        )
+
+
+def overlap_matrix(ax, ay, aside, bx, by, bside):
+    """``len(ax) x len(bx)`` boolean matrix of overlapping integer squares."""
+    if aside <= 0 or bside <= 0:
+        return np.zeros((len(ax), len(bx)), bool)
+    ax = ax[:, None]
+    ay = ay[:, None]
+    return (ax < bx + bside) & (bx < ax + aside) & (ay < by + bside) & (by < ay + aside)
+
+
+def any_overlap(x, y, side, bx, by, bside):
+    """Whether the square ``(x, y, side)`` overlaps any of the squares."""
+    if side <= 0 or bside <= 0 or not len(bx):
+        return False
+    return bool(((x < bx + bside) & (bx < x + side) & (y < by + bside) & (by < y + side)).any())